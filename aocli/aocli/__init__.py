@@ -19,12 +19,14 @@ Message formats:
         "input": <string: Advent of Code input data for the day>,
         "args": <object?: key/value pairs for arguments to the solver>,
         "part": <int?: if the given input is relevant only for one part>,
+        "bench": <BenchRequest?: time each solver over repeated runs>,
     }
 
     Results {
         "answer": <any: the answer for that solver/input>,
         "duration": <float: time in seconds spent solving>,
-        "aside": <Aside?: tabular profiling data>,
+        "aside": <Aside or list of Aside?: tabular profiling data>,
+        "bench": <BenchStats?: present when the input asked for a benchmark>,
     }
 
     Aside {
@@ -32,6 +34,16 @@ Message formats:
         "rows": <list of list of str: cells>,
     }
 
+    BenchRequest {
+        "runs": <int: timed runs of each solver>,
+        "warmup": <int?: untimed runs to do first>,
+    }
+
+    BenchStats {
+        "durations": <list of float: seconds taken by each timed run>,
+        "peak": <int: peak bytes allocated during one more, traced run>,
+    }
+
     Error { "error": true }
 
     Done { "done": true }
@@ -51,3 +63,9 @@ RUNNERS = {
     ".py": "python -u {}",
     ".ts": "pnpm ts-node --swc {}",
 }
+
+# Long-lived processes that can run many days of a language without restarting;
+# see aoc.worker for the protocol on top of the one above.
+WORKERS = {
+    ".py": "python -u -m aoc.worker",
+}
@@ -1,4 +1,5 @@
 import argparse
+import os
 import sys
 from pathlib import Path
 
@@ -10,6 +11,14 @@ from .event_handler import Handler
 from .run import Runner
 from .websocket import WebsocketThread
 
+
+def positive_int(s: str) -> int:
+    n = int(s)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"{s} is not a positive integer")
+    return n
+
+
 parser = argparse.ArgumentParser(prog="aocli", description="CLI for AOC solutions.")
 group = parser.add_mutually_exclusive_group()
 group.add_argument(
@@ -30,6 +39,31 @@ group.add_argument(
     help="relative path to either a year's directory or a single day's file",
     default=str(BASE_DIR),
 )
+parser.add_argument(
+    "-j",
+    "--jobs",
+    type=int,
+    default=1,
+    help="run a year's days across this many parallel processes (0: one per CPU)",
+)
+parser.add_argument(
+    "-b",
+    "--bench",
+    type=positive_int,
+    default=0,
+    metavar="RUNS",
+    help="time each day's main input over this many runs and compare with earlier commits",
+)
+parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="rerun days even if their code and input haven't changed since the last run",
+)
+parser.add_argument(
+    "--warm",
+    action="store_true",
+    help="run days in a long-lived solver process instead of starting one each time",
+)
 
 
 def main():
@@ -52,7 +86,13 @@ def main():
     websocket_thread = WebsocketThread()
     websocket_thread.start()
     websocket_thread.ready.wait()
-    runner = Runner(websocket_thread)
+    runner = Runner(
+        websocket_thread,
+        jobs=args.jobs or os.cpu_count() or 1,
+        warm=args.warm,
+        bench=args.bench,
+        cache=not args.no_cache,
+    )
 
     if args.watch:
         print(f"Listening on {websocket_thread.url}...\n")
@@ -66,12 +106,14 @@ def main():
         except KeyboardInterrupt:
             pass
         finally:
+            runner.close()
             websocket_thread.stop()
             websocket_thread.join()
             observer.stop()
             observer.join()
     else:
         runner.run(args.path)
+        runner.close()
         websocket_thread.stop()
         websocket_thread.join()
 
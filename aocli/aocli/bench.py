@@ -0,0 +1,86 @@
+import json
+import math
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from . import BASE_DIR
+
+HISTORY_FILE = BASE_DIR / ".bench.jsonl"
+WARMUP_RUNS = 1
+# A part has regressed if its median is this much slower than the baseline's,
+# and by more than the floor (so sub-millisecond noise doesn't count).
+REGRESSION_RATIO = 1.1
+REGRESSION_FLOOR = 0.001
+
+
+@dataclass
+class Timing:
+    day: str
+    part: int
+    min: float
+    median: float
+    p95: float
+    peak: int | None
+    runs: int
+    commit: str = ""
+    recorded_at: float = 0
+
+    @classmethod
+    def from_durations(
+        cls, day: str, part: int, durations: list[float], peak: int | None
+    ) -> Timing:
+        ordered = sorted(durations)
+        p95 = ordered[math.ceil(len(ordered) * 0.95) - 1]
+        return cls(day, part, ordered[0], statistics.median(ordered), p95, peak, len(ordered))
+
+    def change_from(self, baseline: Timing) -> float:
+        return self.median / baseline.median - 1 if baseline.median else 0
+
+    def regressed_from(self, baseline: Timing) -> bool:
+        return (
+            self.median > baseline.median * REGRESSION_RATIO
+            and self.median - baseline.median > REGRESSION_FLOOR
+        )
+
+
+def day_key(path: Path) -> str:
+    return f"{path.parent.name}/{path.stem.removeprefix('day')}"
+
+
+def current_commit() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except OSError, subprocess.CalledProcessError:
+        return "unknown"
+
+
+def load_baselines(commit: str, path: Path = HISTORY_FILE) -> dict[tuple[str, int], Timing]:
+    """The most recent timing of each day/part recorded at any other commit."""
+    baselines = {}
+    if not path.exists():
+        return baselines
+    with open(path) as f:
+        for line in f:
+            timing = Timing(**json.loads(line))
+            if timing.commit != commit:
+                baselines[timing.day, timing.part] = timing
+    return baselines
+
+
+def record(timings: list[Timing], commit: str, path: Path = HISTORY_FILE) -> None:
+    now = time.time()
+    with open(path, "a") as f:
+        for timing in timings:
+            timing.commit = commit
+            timing.recorded_at = now
+            f.write(json.dumps(asdict(timing)) + "\n")
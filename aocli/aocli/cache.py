@@ -0,0 +1,103 @@
+"""
+Stored answers for solver runs, so rerunning an unchanged year is instant.
+
+A run is keyed by a hash of everything that could change its answers: the day
+file, every module of the aoc library it (transitively) imports, the aoc
+package's data files, and the input itself. Only Python days are cached, since
+that's the only language whose library dependencies we can follow.
+"""
+
+import ast
+import hashlib
+import json
+from importlib.util import find_spec
+from pathlib import Path
+
+from . import BASE_DIR
+from .data import Input
+from .websocket import ResultMessage
+
+CACHE_DIR = BASE_DIR / ".cache" / "answers"
+LIBRARY = "aoc"
+
+
+def library_dir() -> Path | None:
+    spec = find_spec(LIBRARY)
+    if spec is None or spec.origin is None:
+        return None
+    return Path(spec.origin).parent
+
+
+def module_file(lib: Path, module: str) -> Path | None:
+    parts = module.split(".")[1:]
+    for f in (lib.joinpath(*parts).with_suffix(".py"), lib.joinpath(*parts, "__init__.py")):
+        if f.is_file():
+            return f
+    return None
+
+
+def imported_modules(source: str, package: str | None = None) -> set[str]:
+    """Names of library modules imported by source, itself in package if given."""
+    modules = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level and package:
+                parent = package.rsplit(".", node.level - 1)[0]
+                base = f"{parent}.{base}" if base else parent
+            # `from aoc import coords` may name a submodule; extras are harmless.
+            names = [base, *(f"{base}.{alias.name}" for alias in node.names)]
+        else:
+            continue
+        for name in names:
+            if name == LIBRARY or name.startswith(LIBRARY + "."):
+                # Importing a submodule runs every parent package too.
+                parts = name.split(".")
+                modules.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+    return modules
+
+
+def library_files(lib: Path, source: str) -> list[Path]:
+    files = {f for f in lib.rglob("*") if f.is_file() and f.suffix not in (".py", ".pyc")}
+    pending = imported_modules(source)
+    seen = set()
+    while pending:
+        module = pending.pop()
+        seen.add(module)
+        if (f := module_file(lib, module)) is None:
+            continue
+        files.add(f)
+        package = module if f.name == "__init__.py" else module.rpartition(".")[0]
+        pending |= imported_modules(f.read_text(), package) - seen
+    return sorted(files)
+
+
+def cache_key(path: Path, input: Input) -> str | None:
+    if path.suffix != ".py" or (lib := library_dir()) is None:
+        return None
+    source = path.read_text()
+    h = hashlib.sha256(source.encode())
+    for f in library_files(lib, source):
+        h.update(str(f.relative_to(lib)).encode())
+        h.update(f.read_bytes())
+    h.update(json.dumps([input.input, input.args, input.part], sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def load(key: str) -> list[ResultMessage] | None:
+    try:
+        with open(CACHE_DIR / f"{key}.json") as f:
+            return json.load(f)
+    except OSError, ValueError:
+        return None
+
+
+def store(key: str, results: list[ResultMessage]) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so a parallel run never sees half a file.
+    tmp = CACHE_DIR / f"{key}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(results, f)
+    tmp.replace(CACHE_DIR / f"{key}.json")
@@ -1,7 +1,9 @@
 import json
 import threading
+import time
 from collections.abc import Callable
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from itertools import groupby
 from pathlib import Path
 from queue import Empty, SimpleQueue
@@ -12,10 +14,11 @@ from urllib.error import HTTPError
 from rich.console import Console
 from websockets import ConnectionClosedError
 
-from . import BASE_DIR, RUNNERS
+from . import BASE_DIR, RUNNERS, WORKERS, cache
+from .bench import WARMUP_RUNS, current_commit, day_key, load_baselines, record
 from .data import Input, load_data
-from .ui import BaseUI, Day, Year
-from .websocket import Message, WebsocketThread
+from .ui import BaseUI, Bench, Day, Year, YearRow
+from .websocket import Connection, Message, ResultMessage, WebsocketThread
 
 
 class NoWebsocketConnection(Exception):
@@ -50,50 +53,100 @@ def most_recently_modified(path: Path) -> Path:
     return path
 
 
+def show_asides(ui: BaseUI, msg: ResultMessage) -> None:
+    asides = msg.get("aside", [])
+    for aside in asides if isinstance(asides, list) else [asides]:
+        ui.aside(aside)
+
+
+class Worker:
+    """A warm solver process (see aoc.worker) that runs day files on request."""
+
+    proc: Popen
+    stdout: StdoutThread
+    send: Callable[[str], None]
+    messages: SimpleQueue[Message]
+
+    def __init__(self, proc: Popen, stdout: StdoutThread, connection: Connection) -> None:
+        self.proc = proc
+        self.stdout = stdout
+        self.send, self.messages = connection
+
+    def wait_for(self, *keys: str) -> dict:
+        while self.proc.poll() is None or not self.messages.empty():
+            try:
+                msg = self.messages.get(timeout=0.2)
+            except Empty:
+                continue
+            if any(k in msg for k in keys):
+                return dict(msg)
+        return {}
+
+
 class Runner:
     ws_thread: WebsocketThread
-    proc: Popen | None
+    jobs: int
+    warm: bool
+    bench: int
+    cache: bool
+    procs: set[Popen]
+    workers: dict[str, Worker]
+    has_run: bool
     running: threading.Lock
 
-    def __init__(self, ws_thread: WebsocketThread) -> None:
+    def __init__(
+        self,
+        ws_thread: WebsocketThread,
+        jobs: int = 1,
+        warm: bool = False,
+        bench: int = 0,
+        cache: bool = True,
+    ) -> None:
         self.ws_thread = ws_thread
-        self.proc = None
+        self.jobs = jobs
+        self.warm = warm
+        self.bench = bench
+        self.cache = cache
+        self.procs = set()
+        self.workers = {}
+        self.has_run = False
         self.running = threading.Lock()
 
     def run(self, filename: str) -> None:
         if not self.running.acquire(blocking=False):
-            if self.proc and self.proc.poll() is None:
-                self.proc.terminate()
-                self.proc.wait()
+            self.terminate()
             if not self.running.acquire(timeout=0.2):
                 print("*** runner lock is stuck; giving up")
                 return
 
         # Newline between runs.
-        if self.proc:
+        if self.has_run:
             print()
+        self.has_run = True
 
         try:
             path = Path(filename).resolve()
-            if path.is_file():
+            if self.bench:
+                self.run_bench(path)
+            elif path.is_file():
                 path = most_recently_modified(path)
                 inputs = load_data(path)
-                with Day(path) as ui, self.spawn(path, ui) as (send, messages):
+                with Day(path) as ui, self.spawn(path, ui) as (proc, send, messages):
                     for input in inputs:
                         if not input.is_example:
                             ui.finish_examples()
-                        self.process_input(input, ui, send, messages)
+                        self.process_input(proc, input, ui, send, messages)
                     send(json.dumps({"done": True}))
             elif path.is_dir():
                 files = sorted(f for suffix in RUNNERS for f in path.rglob(f"day??{suffix}"))
                 for year, days in groupby(files, lambda f: f.parent.name):
                     with Year(year) as ui:
-                        for path in days:
-                            with self.spawn(path, ui) as (send, messages):
+                        if self.jobs > 1:
+                            self.run_parallel(ui, list(days))
+                        else:
+                            for path in days:
                                 ui.start_day(path.stem.removeprefix("day"))
-                                input = load_data(path)[-1]
-                                self.process_input(input, ui, send, messages)
-                                send(json.dumps({"done": True}))
+                                self.run_main_input(path, ui)
         except (ConnectionClosedError, KeyboardInterrupt):
             pass
         except HTTPError as err:
@@ -103,50 +156,182 @@ class Runner:
         finally:
             self.running.release()
 
+    def run_bench(self, path: Path) -> None:
+        # Always one day at a time, so solvers aren't competing for CPU.
+        if path.is_file():
+            files = [most_recently_modified(path)]
+        else:
+            files = sorted(f for suffix in RUNNERS for f in path.rglob(f"day??{suffix}"))
+        commit = current_commit()
+        with Bench(load_baselines(commit)) as ui:
+            for path in files:
+                ui.start_day(day_key(path))
+                self.run_main_input(path, ui)
+        record(ui.timings, commit)
+
+    def run_main_input(self, path: Path, ui: BaseUI, key: str = "") -> None:
+        input = load_data(path)[-1]
+        cache_key = cache.cache_key(path, input) if self.cache and not self.bench else None
+        if cache_key and (results := cache.load(cache_key)) is not None:
+            answers = iter(input.answers)
+            for msg in results:
+                ui.complete(msg["answer"], next(answers, None), msg["duration"])
+                ui.start_run()
+                show_asides(ui, msg)
+            return
+        with self.spawn(path, ui, key) as (proc, send, messages):
+            results = self.process_input(proc, input, ui, send, messages)
+            send(json.dumps({"done": True}))
+        if cache_key and results:
+            cache.store(cache_key, results)
+
+    def run_parallel(self, year: Year, days: list[Path]) -> None:
+        # Rows are added up front so the table stays in day order no matter
+        # which solver finishes first.
+        rows = [YearRow(year, year.start_day(path.stem.removeprefix("day"))) for path in days]
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [
+                pool.submit(self.run_main_input, path, row, f"{path.parent.name}/{path.stem}")
+                for path, row in zip(days, rows, strict=True)
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                self.terminate()
+                raise
+
+    def terminate(self) -> None:
+        for proc in list(self.procs):
+            if proc.poll() is None:
+                proc.terminate()
+                proc.wait()
+
+    def close(self) -> None:
+        for worker in self.workers.values():
+            if worker.proc.poll() is None:
+                with suppress(ConnectionClosedError):
+                    worker.send(json.dumps({"done": True}))
+            worker.proc.wait()
+            worker.stdout.join()
+            self.procs.discard(worker.proc)
+        self.workers.clear()
+
     @contextmanager
-    def spawn(self, path, ui: BaseUI):
+    def spawn(self, path, ui: BaseUI, key: str = ""):
+        # Parallel runs keep one process per day; their startup overlaps anyway.
+        if self.warm and not key and path.suffix in WORKERS:
+            with self.dispatch(path, ui) as connection:
+                yield connection
+            return
         args = [x.format(path) for x in RUNNERS[path.suffix].split()]
-        args.append(self.ws_thread.url)
-        self.proc = proc = Popen(args, stdout=PIPE, stderr=STDOUT, text=True)
+        args.append(self.ws_thread.url_for(key))
+        queue = self.ws_thread.queue_for(key)
+        proc = Popen(args, stdout=PIPE, stderr=STDOUT, text=True)
+        self.procs.add(proc)
         assert proc.stdout is not None
         stdout = StdoutThread(proc.stdout, ui.live.console)
         stdout.start()
         try:
-            send, messages = self.ws_thread.queue.get(timeout=1)
-            yield send, messages
-        except Empty:
-            raise NoWebsocketConnection() from None
+            send, messages = self.connect(proc, queue)
+            yield proc, send, messages
         finally:
             if proc.wait() != 0:
                 ui.error()
                 stdout.quit()
             stdout.join()
+            self.procs.discard(proc)
+
+    @contextmanager
+    def dispatch(self, path: Path, ui: BaseUI):
+        worker = self.ready_worker(path, ui)
+        try:
+            yield worker.proc, worker.send, worker.messages
+        finally:
+            exit = worker.wait_for("exit")
+            if exit.get("exit", worker.proc.poll() or 1) != 0:
+                ui.error()
+
+    def ready_worker(self, path: Path, ui: BaseUI) -> Worker:
+        # A stale worker (its library code changed) exits, and so gets one retry.
+        for _ in range(2):
+            worker = self.workers.get(path.suffix)
+            if worker is None or worker.proc.poll() is not None:
+                worker = self.workers[path.suffix] = self.start_worker(path.suffix, ui)
+            worker.stdout.console = ui.live.console
+            worker.send(json.dumps({"run": str(path)}))
+            if "ready" in worker.wait_for("ready", "stale"):
+                return worker
+            worker.proc.wait()
+            worker.stdout.join()
+            self.procs.discard(worker.proc)
+            del self.workers[path.suffix]
+        raise NoWebsocketConnection()
+
+    def start_worker(self, suffix: str, ui: BaseUI) -> Worker:
+        key = f"worker{suffix}"
+        args = [*WORKERS[suffix].split(), self.ws_thread.url_for(key)]
+        proc = Popen(args, stdout=PIPE, stderr=STDOUT, text=True)
+        self.procs.add(proc)
+        assert proc.stdout is not None
+        stdout = StdoutThread(proc.stdout, ui.live.console)
+        stdout.start()
+        return Worker(proc, stdout, self.connect(proc, self.ws_thread.queue_for(key)))
+
+    def connect(self, proc: Popen, queue: SimpleQueue[Connection]) -> Connection:
+        # Interpreters starting side by side take longer to connect, but
+        # there's no point waiting on one that has already exited.
+        deadline = time.monotonic() + (1 if self.jobs == 1 else 10)
+        while True:
+            try:
+                return queue.get(timeout=0.1)
+            except Empty:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    try:
+                        return queue.get_nowait()
+                    except Empty:
+                        raise NoWebsocketConnection() from None
 
     def process_input(
         self,
+        proc: Popen,
         input: Input,
         ui: BaseUI,
         send: Callable[[str], None],
         messages: SimpleQueue[Message],
-    ):
+    ) -> list[ResultMessage] | None:
+        """Run one input, returning its results if every solver succeeded."""
         msg = {"args": input.args, "input": input.input, "part": input.part}
+        if self.bench:
+            msg["bench"] = {"runs": self.bench, "warmup": WARMUP_RUNS}
         send(json.dumps(msg))
         answers = iter(input.answers)
-        while (self.proc and self.proc.poll() is None) or not messages.empty():
+        results: list[ResultMessage] | None = []
+        while proc.poll() is None or not messages.empty():
             try:
                 msg = messages.get(timeout=0.2)
             except Empty:
                 continue
 
             if "done" in msg:
-                break
+                return results
             elif "error" in msg:
                 ui.error()
+                results = None
             elif "status" in msg:
                 ui.status(msg["status"])
             elif "answer" in msg and "duration" in msg:
                 expected = next(answers, None)
                 ui.complete(msg["answer"], expected, msg["duration"])
+                if results is not None:
+                    result: ResultMessage = {"answer": msg["answer"], "duration": msg["duration"]}
+                    if "aside" in msg:
+                        result["aside"] = msg["aside"]
+                    results.append(result)
                 ui.start_run()
-                if "aside" in msg:
-                    ui.aside(msg["aside"])
+                show_asides(ui, msg)
+                if "bench" in msg:
+                    ui.bench(msg["bench"])
+        return None
@@ -11,7 +11,10 @@ from rich.rule import Rule
 from rich.spinner import Spinner
 from rich.table import Table
 
-from .websocket import Aside
+from aoc.util import format_bytes
+
+from .bench import Timing
+from .websocket import Aside, BenchStats
 
 
 class DayRun(NamedTuple):
@@ -78,6 +81,9 @@ class BaseUI:
     def aside(self, aside: Aside) -> None:
         return  # default to ignore
 
+    def bench(self, stats: BenchStats) -> None:
+        return  # default to ignore
+
 
 class Year(BaseUI):
     stars: int
@@ -108,11 +114,12 @@ class Year(BaseUI):
         )
         return table
 
-    def start_day(self, day: str):
+    def start_day(self, day: str) -> int:
         self.days.append((day, []))
+        return len(self.days) - 1
 
-    def complete(self, result, expected, duration):
-        _, parts = self.days[-1]
+    def complete(self, result, expected, duration, row: int = -1):
+        _, parts = self.days[row]
         success = "[green]✓" if result == expected else "[red]×"
         parts.append(" ".join([format_duration(duration), success]))
         if result == expected:
@@ -121,11 +128,32 @@ class Year(BaseUI):
             if self.stars >= self.max_stars - 1:
                 self.stars = self.max_stars
 
-    def error(self):
-        _, parts = self.days[-1]
+    def error(self, row: int = -1):
+        _, parts = self.days[row]
         parts.append("[red]Error ×")
 
 
+class YearRow(BaseUI):
+    """One day's row in a Year table, for days running in parallel."""
+
+    year: Year
+    row: int
+
+    def __init__(self, year: Year, row: int):
+        # Share the year's live display rather than starting another.
+        self.live = year.live
+        self.done = False
+        self.run_started_at = time.time()
+        self.year = year
+        self.row = row
+
+    def complete(self, result, expected, duration):
+        self.year.complete(result, expected, duration, row=self.row)
+
+    def error(self):
+        self.year.error(row=self.row)
+
+
 class Day(BaseUI):
     asides: Group
     last_status: str = ""
@@ -204,5 +232,95 @@ class Day(BaseUI):
         for row in aside["rows"]:
             table.add_row(*row)
         run = self.runs[-1]
-        self.runs[-1] = run._replace(duration=run.duration + " [bright_white]→")
+        if not run.duration.endswith("→"):
+            self.runs[-1] = run._replace(duration=run.duration + " [bright_white]→")
         self.asides.renderables.append(table)
+
+
+class BenchRow(NamedTuple):
+    day: str
+    part: int
+    timing: Timing | None
+    is_correct: bool
+
+
+class Bench(BaseUI):
+    baselines: dict[tuple[str, int], Timing]
+    day: str
+    rows: list[BenchRow]
+
+    def __init__(self, baselines: dict[tuple[str, int], Timing]):
+        super().__init__()
+        self.baselines = baselines
+        self.day = ""
+        self.rows = []
+
+    @property
+    def timings(self) -> list[Timing]:
+        return [row.timing for row in self.rows if row.timing is not None]
+
+    def __rich__(self):
+        table = Table(box=box.ROUNDED)
+        table.add_column("Day")
+        table.add_column("Part")
+        for name in ("min", "median", "p95", "peak", "change"):
+            table.add_column(name, justify="right")
+
+        regressions = 0
+        for row in self.rows:
+            part = f"{row.part} " + ("[green]✓" if row.is_correct else "[red]×")
+            if row.timing is None:
+                table.add_row(row.day, part, "[red]Error")
+                continue
+            t = row.timing
+            change = "[dim]new"
+            if baseline := self.baselines.get((t.day, t.part)):
+                color = "dim"
+                if t.regressed_from(baseline):
+                    color = "red"
+                    regressions += 1
+                elif baseline.regressed_from(t):
+                    color = "green"
+                change = f"[{color}]{t.change_from(baseline):+.0%}"
+            table.add_row(
+                row.day,
+                part,
+                format_duration(t.min),
+                format_duration(t.median),
+                format_duration(t.p95),
+                "[dim]-" if t.peak is None else format_bytes(t.peak),
+                change,
+            )
+
+        if not self.done:
+            table.add_row(
+                self.day,
+                str(self.next_part()),
+                Spinner("line"),
+                format_duration(time.time() - self.run_started_at),
+            )
+        table.add_section()
+        summary = f"[red]{regressions} regressed" if regressions else "[green]no regressions"
+        table.add_row("", "", "", "", "", "", summary)
+        return table
+
+    def next_part(self) -> int:
+        return sum(row.day == self.day for row in self.rows) + 1
+
+    def start_day(self, day: str) -> None:
+        self.day = day
+        self.start_run()
+
+    def complete(self, result, expected, duration):
+        # A solver that can't repeat itself still gets a row from its one run.
+        part = self.next_part()
+        timing = Timing.from_durations(self.day, part, [duration], None)
+        self.rows.append(BenchRow(self.day, part, timing, result == expected))
+
+    def bench(self, stats: BenchStats):
+        row = self.rows[-1]
+        timing = Timing.from_durations(row.day, row.part, stats["durations"], stats["peak"])
+        self.rows[-1] = row._replace(timing=timing)
+
+    def error(self):
+        self.rows.append(BenchRow(self.day, self.next_part(), None, False))
@@ -16,10 +16,16 @@ class Aside(TypedDict):
     rows: list[list[str]]
 
 
+class BenchStats(TypedDict):
+    durations: list[float]
+    peak: int
+
+
 class ResultMessage(TypedDict):
     answer: Any
     duration: float
-    aside: NotRequired[Aside]
+    aside: NotRequired[Aside | list[Aside]]
+    bench: NotRequired[BenchStats]
 
 
 class DoneMessage(TypedDict):
@@ -34,9 +40,10 @@ Message = ResultMessage | DoneMessage | StatusMessage
 Connection = tuple[Callable[[str], None], SimpleQueue[Message]]
 
 
-def on_connection(queue: SimpleQueue[Connection], websocket: ServerConnection) -> None:
+def on_connection(thread: WebsocketThread, websocket: ServerConnection) -> None:
     messages = SimpleQueue()
-    queue.put((websocket.send, messages))
+    path = websocket.request.path if websocket.request else "/"
+    thread.queue_for(path).put((websocket.send, messages))
     try:
         for message in websocket:
             messages.put(json.loads(message))
@@ -46,6 +53,13 @@ def on_connection(queue: SimpleQueue[Connection], websocket: ServerConnection) -
 
 
 class WebsocketThread(BaseThread):
+    """Accepts solver connections, routed to a queue by their URL path.
+
+    Solvers spawned with `url` land in `queue`; those spawned with
+    `url_for(key)` land in `queue_for(key)`, which lets several solvers
+    connect at once without their connections getting mixed up.
+    """
+
     host = "localhost"
     port = 8765
     queue: SimpleQueue[Connection]
@@ -53,11 +67,22 @@ class WebsocketThread(BaseThread):
 
     def __init__(self):
         super().__init__()
-        self.queue = SimpleQueue()
+        self._queues: dict[str, SimpleQueue[Connection]] = {}
+        self._queues_lock = threading.Lock()
+        self.queue = self.queue_for("/")
         self.ready = threading.Event()
 
+    def queue_for(self, key: str) -> SimpleQueue[Connection]:
+        path = "/" + key.strip("/")
+        with self._queues_lock:
+            return self._queues.setdefault(path, SimpleQueue())
+
+    def url_for(self, key: str) -> str:
+        key = key.strip("/")
+        return f"{self.url}/{key}" if key else self.url
+
     def run(self) -> None:
-        handler = functools.partial(on_connection, self.queue)
+        handler = functools.partial(on_connection, self)
         while True:
             try:
                 with serve(handler, self.host, self.port) as server:
@@ -1,35 +1,32 @@
 from aoc import main
 from aoc.coords import Dir, Grid, Point
-from aoc.graph import Goal, shortest_path_length
+from aoc.graph import Sources, shortest_path_length
 
 
-# TODO consider supporting multiple starts in _dijkstra so I don't have to do
-# this inverted hack.
-class ReversedHeightMap:
+class HeightMap:
     def __init__(self, s: str):
         self.grid = Grid(s)
-        self.start = self.grid.find("E")
+        self.end = self.grid.find("E")
 
     def __getitem__(self, node: Point) -> set[Point]:
         h = self.height(node)
-        return {n for n in Dir.neighbors(node) if n in self.grid and h - 1 <= self.height(n)}
+        return {n for n in Dir.neighbors(node) if n in self.grid and self.height(n) <= h + 1}
 
     def height(self, point: Point) -> int:
         c = self.grid[point]
         return ord({"S": "a", "E": "z"}.get(c, c))
 
 
-def to_start(s: str) -> int:
-    G = ReversedHeightMap(s)
-    end = G.grid.find("S")
-    return shortest_path_length(G, G.start, end)
+def from_start(s: str) -> int:
+    G = HeightMap(s)
+    return shortest_path_length(G, G.grid.find("S"), G.end)
 
 
-def to_any_a(s: str) -> int:
-    G = ReversedHeightMap(s)
-    goal = Goal[Point](lambda n: G.grid[n] in "Sa")
-    return shortest_path_length(G, G.start, goal)
+def from_any_a(s: str) -> int:
+    G = HeightMap(s)
+    starts = Sources(G.grid.findall("S") + G.grid.findall("a"))
+    return shortest_path_length(G, starts, G.end)
 
 
 if __name__ == "__main__":
-    main(to_start, to_any_a)
+    main(from_start, from_any_a)
@@ -1,61 +1,62 @@
 from itertools import batched
 
 from aoc import main
-from aoc.coords import Dir, Dir8, Point, addp, line_between
+from aoc.coords import PackedPoints, line_between
 from aoc.parse import all_numbers, line_parser
 from aoc.util import sliding_window
 
-EMITTER = (500, 0)
+# Packed so the fall is int additions; x stays well inside the stride.
+P = PackedPoints(2048)
+EMITTER = P.pack((500, 0))
+FALLS = (P.S, P.SW, P.SE)
 
 
 @line_parser
 def parse(line: str):
     points = [(a, b) for a, b in batched(all_numbers(line), 2)]
-    return {p for a, b in sliding_window(points, 2) for p in line_between(a, b)}
+    return {P.pack(p) for a, b in sliding_window(points, 2) for p in line_between(a, b)}
 
 
-def drop_sand(filled: set[Point], bottom: int, solid_bottom=False) -> Point:
+def drop_sand(filled: set[int], bottom: int, solid_bottom=False) -> int:
     cur = EMITTER
-    while True:
-        if cur[1] == bottom - (1 if solid_bottom else 0):
-            break
-        elif (
-            (p := addp(cur, Dir.S)) not in filled
-            or (p := addp(cur, Dir8.SW)) not in filled
-            or (p := addp(cur, Dir8.SE)) not in filled
-        ):
-            pass
+    # Packed points order by row first, so this is "above the last row".
+    last_row = (bottom - (1 if solid_bottom else 0)) * P.stride
+    while cur < last_row:
+        for d in FALLS:
+            if (p := cur + d) not in filled:
+                cur = p
+                break
         else:
             break
-        cur = p
     return cur
 
 
 def sand_at_rest(s: str) -> int:
-    rocks: set[Point] = set.union(*parse(s))
-    bottom = max(p[1] for p in rocks)
+    filled: set[int] = set.union(*parse(s))
+    bottom = max(filled) // P.stride
 
-    sand: set[Point] = set()
+    sand = 0
     while True:
-        grain = drop_sand(rocks | sand, bottom)
-        if grain[1] >= bottom:
+        grain = drop_sand(filled, bottom)
+        if grain >= bottom * P.stride:
             break
-        sand.add(grain)
-    return len(sand)
+        filled.add(grain)
+        sand += 1
+    return sand
 
 
 def sand_until_blocked(s: str) -> int:
-    rocks: set[Point] = set.union(*parse(s))
-    bottom = max(p[1] for p in rocks) + 2
+    rocks: set[int] = set.union(*parse(s))
+    bottom = max(rocks) // P.stride + 2
 
-    sand: set[Point] = set()
+    sand = 0
     while True:
         grain = drop_sand(rocks, bottom, solid_bottom=True)
-        sand.add(grain)
+        sand += 1
         rocks.add(grain)
         if grain == EMITTER:
             break
-    return len(sand)
+    return sand
 
 
 if __name__ == "__main__":
@@ -1,10 +1,10 @@
-from itertools import product
+from itertools import batched, product
 from typing import Final
 
 from aoc import main
-from aoc.collections import Range
+from aoc.collections import IntervalSet
 from aoc.coords import Point, mdist
-from aoc.parse import all_numbers
+from aoc.parse import number_array
 
 FREQUENCY_MULTIPLIER: Final[int] = 4000000
 
@@ -12,8 +12,7 @@ FREQUENCY_MULTIPLIER: Final[int] = 4000000
 def parse(s: str) -> tuple[dict[Point, int], list[Point]]:
     sensors = {}
     beacons = []
-    for line in s.splitlines():
-        (sx, sy, bx, by) = all_numbers(line)
+    for sx, sy, bx, by in batched(number_array(s), 4, strict=True):
         sensor = (sx, sy)
         beacon = (bx, by)
         sensors[sensor] = mdist(sensor, beacon)
@@ -22,18 +21,12 @@ def parse(s: str) -> tuple[dict[Point, int], list[Point]]:
 
 
 def no_beacon_count(sensors, beacons, target_y: int) -> int:
-    ranges = []
-    target_range = Range(target_y, target_y)
+    covered = []
     for (x, y), d in sensors.items():
-        if not Range(y - d, y + d).overlaps(target_range):
-            continue
         y_dist = d - abs(y - target_y)
-        ranges.append(Range(x - y_dist, x + y_dist))
-    range = Range.union(*ranges)[0]
-    object_xs = {
-        x for x, y in [*sensors, *beacons] if y == target_y and range.overlaps(Range(x, x))
-    }
-    return len(range) - len(object_xs)
+        covered.append((x - y_dist, x + y_dist))
+    objects = IntervalSet((x, x) for x, y in [*sensors, *beacons] if y == target_y)
+    return len(IntervalSet(covered) - objects)
 
 
 # https://www.reddit.com/r/adventofcode/comments/zmcn64/comment/j0b90nr/
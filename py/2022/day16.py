@@ -1,19 +1,17 @@
-import re
 from collections import defaultdict
 from itertools import combinations
 
 from aoc import main
-from aoc.graph import IterableEdges, all_shortest_path_lengths
-from aoc.parse import all_numbers
+from aoc.graph import Edges, distance_matrix
+from aoc.parse import records
 
+VALVE = "Valve {name:word} has flow rate={rate:int}; {} valve{} {tunnels:words}"
 
-def parse(s: str) -> tuple[IterableEdges, dict[str, int]]:
-    name_pat = re.compile(r"[A-Z]{2}")
+
+def parse(s: str) -> tuple[Edges[str], dict[str, int]]:
     edges = {}
     flow = {}
-    for line in s.splitlines():
-        name, *tunnels = name_pat.findall(line)
-        rate = all_numbers(line)[0]
+    for name, rate, tunnels in records(VALVE, s):
         edges[name] = set(tunnels)
         flow[name] = rate
     return edges, flow
@@ -21,19 +19,25 @@ def parse(s: str) -> tuple[IterableEdges, dict[str, int]]:
 
 def max_pressure(s: str, minutes: int, elephant=False):
     G, flow = parse(s)
-    openable = frozenset(name for name, rate in flow.items() if rate)
-    distance = all_shortest_path_lengths(G)
-
-    queue: list[tuple[str, int, frozenset[str], int]] = [("AA", 0, frozenset(), 0)]
-    best: dict[frozenset[str], int] = defaultdict(int)
+    openable = [name for name, rate in flow.items() if rate]
+    distance = distance_matrix(G, ["AA", *openable])
+    # The search works on matrix indexes, with opened valves as a bitmask.
+    valves = [distance.index[name] for name in openable]
+    rates = [flow[name] for name in distance.nodes]
+
+    queue: list[tuple[int, int, int, int]] = [(distance.index["AA"], 0, 0, 0)]
+    best: dict[int, int] = defaultdict(int)
     while queue:
-        name, t, opened, pressure = queue.pop()
+        cur, t, opened, pressure = queue.pop()
         best[opened] = max(pressure, best[opened])
-        for next in openable - opened:
-            nt = t + distance[name, next] + 1
+        row = distance.rows[cur]
+        for next in valves:
+            if opened >> next & 1:
+                continue
+            nt = t + row[next] + 1
             if nt >= minutes:
                 continue
-            queue.append((next, nt, opened | {next}, pressure + flow[next] * (minutes - nt)))
+            queue.append((next, nt, opened | 1 << next, pressure + rates[next] * (minutes - nt)))
 
     if not elephant:
         return max(best.values())
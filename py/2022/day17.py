@@ -1,5 +1,5 @@
 from aoc import main
-from aoc.coords import Dir, Grid, Point, Vector, addp, line_between
+from aoc.coords import Dir, Grid, PackedPoints
 
 ROCKS = """
 ####
@@ -21,27 +21,26 @@ ROCKS = """
 ##
 """
 
-type Rock = tuple[list[Point], int]
+# The chamber is only 7 wide, so a small stride leaves room for x in [-8, 8).
+P = PackedPoints(16)
 
+type Rock = tuple[list[int], int, int]  # packed cells relative to top left, width, height
 
-def parse(s: str) -> tuple[list[Vector], list[Rock]]:
+
+def parse(s: str) -> tuple[list[int], list[Rock]]:
     rocks = [Grid(rock).findall("#") for rock in ROCKS.strip().split("\n\n")]
     return (
-        [Dir.parse(c) for c in s.replace("\n", "")],
-        [(rock, max(y for _, y in rock) + 1) for rock in rocks],
+        [P.pack(Dir.parse(c)) for c in s.replace("\n", "")],
+        [
+            ([P.pack(p) for p in rock], max(x for x, _ in rock) + 1, max(y for _, y in rock) + 1)
+            for rock in rocks
+        ],
     )
 
 
-def move_rock(rock: list[Point], dir: Vector, filled: set[Point]) -> tuple[list[Point], bool]:
-    newpos = [addp(p, dir) for p in rock]
-    if not all(0 <= p[0] <= 6 and p not in filled for p in newpos):
-        return rock, False
-    return newpos, True
-
-
 def top_after(s: str, cycles: int) -> int:
     jets, rocks = parse(s)
-    filled = set(line_between((0, 0), (6, 0)))
+    filled = {P.pack((x, 0)) for x in range(7)}
     highest_filled = 0
     jet_idx = 0
     seen = {}
@@ -57,14 +56,21 @@ def top_after(s: str, cycles: int) -> int:
                 break
         seen[key] = i, highest_filled
 
-        rock, rock_height = rocks[rock_idx]
-        cur, moved = move_rock(rock, (2, highest_filled - rock_height - 3), filled)
-        while moved:
-            cur, moved = move_rock(cur, jets[jet_idx], filled)
-            cur, moved = move_rock(cur, Dir.S, filled)
+        # Track x separately so wall checks don't need to unpack every cell.
+        cells, width, height = rocks[rock_idx]
+        x = 2
+        pos = P.pack((x, highest_filled - height - 3))
+        while True:
+            jet = jets[jet_idx]
             jet_idx = (jet_idx + 1) % len(jets)
-        filled |= set(cur)
-        highest_filled = min([highest_filled] + [y for _, y in cur])
+            if 0 <= x + jet <= 7 - width and not any(pos + jet + c in filled for c in cells):
+                x += jet
+                pos += jet
+            if any(pos + P.S + c in filled for c in cells):
+                break
+            pos += P.S
+        filled.update(pos + c for c in cells)
+        highest_filled = min(highest_filled, P.unpack(pos)[1])
     return abs(highest_filled)
 
 
@@ -1,64 +1,62 @@
 from collections import deque
+from functools import reduce
 from itertools import count
+from operator import or_
 
 from aoc import main
-from aoc.coords import Dir8 as Dir
-from aoc.coords import Point, addp, find_bounds
+from aoc.bitgrid import BitGrid
+from aoc.coords import Dir8, find_bounds
 
 
-def parse(s: str) -> set[Point]:
-    elves = set()
-    for y, line in enumerate(s.splitlines()):
-        for x, c in enumerate(line):
-            if c == "#":
-                elves.add((x, y))
-    return elves
+def parse(s: str) -> tuple[BitGrid, int]:
+    lines = s.splitlines()
+    B = BitGrid(len(lines[0]), len(lines))
+    elves = B.mask((x, y) for y, line in enumerate(lines) for x, c in enumerate(line) if c == "#")
+    return B, elves
+
+
+def pad(B: BitGrid, elves: int, margin: int) -> tuple[BitGrid, int]:
+    padded = BitGrid(B.width + 2 * margin, B.height + 2 * margin)
+    return padded, padded.mask((x + margin, y + margin) for x, y in B.points(elves))
 
 
 def elf_life(s: str, rounds: int | None = None) -> int:
-    elves = parse(s)
-    rules = deque(
-        [
-            (Dir.N, set([Dir.N, Dir.NE, Dir.NW])),
-            (Dir.S, set([Dir.S, Dir.SE, Dir.SW])),
-            (Dir.W, set([Dir.W, Dir.NW, Dir.SW])),
-            (Dir.E, set([Dir.E, Dir.NE, Dir.SE])),
-        ]
-    )
+    B, elves = parse(s)
+    N, NE, E, SE, S, SW, W, NW = Dir8
+    rules = deque([(N, (N, NE, NW)), (S, (S, SE, SW)), (W, (W, NW, SW)), (E, (E, NE, SE))])
 
-    dirs = list(Dir)  # optimization
     iterator = count(1) if rounds is None else range(rounds)
     for round in iterator:
+        # Elves spread out by at most one step per round; keep them off the edge.
+        if elves & B.border:
+            B, elves = pad(B, elves, max(B.width, B.height) // 2)
+
+        # near[d] is the cells with an elf in direction d.
+        near = dict(zip(Dir8, B.neighbors(elves, diagonal=True), strict=True))
+        undecided = elves & reduce(or_, near.values())
+        targets = {}
+        for dir, check in rules:
+            proposing = undecided & ~(near[check[0]] | near[check[1]] | near[check[2]])
+            undecided &= ~proposing
+            targets[dir] = B.shift(proposing, *dir)
+
+        # Only two elves in opposing directions can propose the same cell.
+        clashes = (targets[N] & targets[S]) | (targets[W] & targets[E])
         moves = 0
-        current_elves = elves.copy()
-        for elf in current_elves:
-            neighbors = {d for d in dirs if addp(elf, d) in current_elves}
-            if not neighbors:
-                continue
-            for dir, check in rules:
-                if not neighbors & check:
-                    next = addp(elf, dir)
-                    if next in elves:
-                        # Only two elves in opposing directions can conflict.
-                        moves -= 1
-                        elves.remove(next)
-                        elves.add(addp(next, dir))
-                    else:
-                        moves += 1
-                        elves.add(next)
-                        elves.remove(elf)
-                    break
+        for (dx, dy), target in targets.items():
+            target &= ~clashes
+            elves = (elves & ~B.shift(target, -dx, -dy)) | target
+            moves += target.bit_count()
 
         if moves == 0:
             return round
         rules.rotate(-1)
 
-    (ax, ay), (bx, by) = find_bounds(elves)
+    (ax, ay), (bx, by) = find_bounds(list(B.points(elves)))
     rect = (bx + 1 - ax) * (by + 1 - ay)
-    return rect - len(elves)
+    return rect - elves.bit_count()
 
 
-# TODO optimize part 2; currently 1.91s
 if __name__ == "__main__":
     main(
         lambda s: elf_life(s, 10),
@@ -1,63 +1,54 @@
-from functools import cache, partial
-from typing import Callable
+from functools import reduce
+from operator import or_
 
 from aoc import main
-from aoc.coords import Dir, Point, Vector, find_bounds
-from aoc.util import mod_range
-
-Blizzard = tuple[Point, Vector]
-
-
-def parse(s: str) -> tuple[frozenset[Point], frozenset[Blizzard]]:
-    walkable = set[Point]()
-    blizzards = set[Blizzard]()
-    for y, line in enumerate(s.splitlines()):
-        for x, c in enumerate(line):
-            if c == "#":
-                continue
-            walkable.add((x, y))
-            try:
-                dir = Dir.parse(c)
-            except KeyError:
-                continue
-            blizzards.add(((x, y), dir))
-    return frozenset(walkable), frozenset(blizzards)
-
-
-def walk(
-    walkable: frozenset[Point],
-    blizzards_at: Callable[[int], set[Point]],
-    start: Point,
-    goal: Point,
-    t: int = 0,
-):
-    q: set[Point] = {start}
-    options = [(0, 0), *list(Dir)]
-    while goal not in q:
+from aoc.bitgrid import BitGrid
+from aoc.coords import Dir, Vector
+
+Blizzard = tuple[int, Vector]  # every blizzard moving in one direction
+
+
+def parse(s: str) -> tuple[BitGrid, list[Blizzard], int, int]:
+    """The valley inside the walls, its blizzards, and the cells by the entrance and exit."""
+    lines = s.splitlines()
+    valley = [line[1:-1] for line in lines[1:-1]]
+    B = BitGrid(len(valley[0]), len(valley))
+    blizzards = [
+        (
+            B.mask(
+                (x, y) for y, row in enumerate(valley) for x, c in enumerate(row) if c in arrows
+            ),
+            d,
+        )
+        for d, arrows in [(Dir.N, "^"), (Dir.E, ">"), (Dir.S, "v"), (Dir.W, "<")]
+    ]
+    start = B.bit((lines[0].index(".") - 1, 0))
+    goal = B.bit((lines[-1].index(".") - 1, B.height - 1))
+    return B, blizzards, start, goal
+
+
+def walk(B: BitGrid, blizzards: list[Blizzard], start: int, goal: int, t: int = 0) -> int:
+    # Waiting outside the valley is always safe, so the cell by the start can be
+    # entered whenever it's clear; the goal is one step on from the cell by it.
+    q = 0
+    while not q & goal:
         t += 1
-        q = {(px + dx, py + dy) for dx, dy in options for px, py in q}
-        q &= walkable - blizzards_at(t)
-    return t
+        blizzards_at = reduce(or_, (B.roll(m, t * dx, t * dy) for m, (dx, dy) in blizzards))
+        q = (B.spread(q) | start) & ~blizzards_at
+    return t + 1
 
 
 def expedition(
-    walkable: frozenset[Point],
-    blizzards: frozenset[Blizzard],
+    B: BitGrid,
+    blizzards: list[Blizzard],
+    start: int,
+    goal: int,
     get_snacks: bool = False,
-):
-    (min_x, min_y), (max_x, max_y) = find_bounds(walkable)
-    start = next((x, y) for x, y in walkable if y == min_y)
-    goal = next((x, y) for x, y in walkable if y == max_y)
-    modx = cache(partial(mod_range, lower=min_x, upper=max_x + 1))
-    mody = cache(partial(mod_range, lower=min_y + 1, upper=max_y))
-
-    def blizzards_at(t: int) -> set[Point]:
-        return {(modx(x + t * dx), mody(y + t * dy)) for (x, y), (dx, dy) in blizzards}
-
-    t = walk(walkable, blizzards_at, start, goal)
+) -> int:
+    t = walk(B, blizzards, start, goal)
     if get_snacks:
-        t = walk(walkable, blizzards_at, goal, start, t)
-        t = walk(walkable, blizzards_at, start, goal, t)
+        t = walk(B, blizzards, goal, start, t)
+        t = walk(B, blizzards, start, goal, t)
     return t
 
 
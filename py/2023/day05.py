@@ -4,6 +4,7 @@ from functools import reduce
 from typing import Callable, NamedTuple
 
 from aoc import main
+from aoc.collections import IntervalSet, OffsetMap
 from aoc.parse import all_numbers, paras
 from aoc.util import chunks
 
@@ -35,29 +36,19 @@ def parse(s: str) -> tuple[list[int], list[list[Map]]]:
     return seeds, nmaps
 
 
-def next_category(src_ranges, maps: list[Map]):
-    dst_ranges = []
-    for start, start_range in src_ranges:
-        while start_range > 0:
-            for dst, src, size in maps:
-                if src <= start < src + size:
-                    size -= max(start - src, size - start_range)
-                    dst_ranges.append((start - src + dst, size))
-                    start += size
-                    start_range -= size
-                    break
-            else:
-                dst_ranges.append((start, start_range))
-                break
-    return dst_ranges
+def offset_map(maps: list[Map]) -> OffsetMap:
+    return OffsetMap((src, src + size - 1, dst - src) for dst, src, size in maps)
 
 
 def lowest_location(seeds: list[int], almanac: list[list[Map]], seed_fn: Callable) -> int:
-    return min(reduce(next_category, almanac, seed_fn(seeds)))[0]
+    seed_to_location = reduce(OffsetMap.then, map(offset_map, almanac))
+    return seed_to_location.apply(seed_fn(seeds)).starts[0]
 
 
 if __name__ == "__main__":
     main(
-        lambda s: lowest_location(*parse(s), lambda seeds: [(s, 1) for s in seeds]),
-        lambda s: lowest_location(*parse(s), lambda seeds: chunks(seeds, 2)),
+        lambda s: lowest_location(*parse(s), lambda seeds: IntervalSet((s, s) for s in seeds)),
+        lambda s: lowest_location(
+            *parse(s), lambda seeds: IntervalSet((s, s + n - 1) for s, n in chunks(seeds, 2))
+        ),
     )
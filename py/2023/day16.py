@@ -50,6 +50,6 @@ def best_beam_start(grid: Grid) -> int:
 
 if __name__ == "__main__":
     main(
-        lambda s: energize(Grid(s), (0, 0), Dir.E),
-        lambda s: best_beam_start(Grid(s)),
+        lambda s: energize(Grid(s, dense=True), (0, 0), Dir.E),
+        lambda s: best_beam_start(Grid(s, dense=True)),
     )
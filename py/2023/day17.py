@@ -43,6 +43,6 @@ def min_heat_loss(grid: Grid[int], max_dir=3, min_dir=0) -> int:
 
 if __name__ == "__main__":
     main(
-        lambda s: min_heat_loss(Grid(s, int), max_dir=3),
-        lambda s: min_heat_loss(Grid(s, int), min_dir=4, max_dir=10),
+        lambda s: min_heat_loss(Grid(s, int, dense=True), max_dir=3),
+        lambda s: min_heat_loss(Grid(s, int, dense=True), min_dir=4, max_dir=10),
     )
@@ -1,10 +1,9 @@
-import re
 from dataclasses import dataclass
 from math import prod
 from operator import gt, lt
 
 from aoc import main
-from aoc.parse import paras
+from aoc.parse import iter_paras, paras, record_format
 
 
 @dataclass
@@ -29,23 +28,20 @@ Part = dict[str, int]
 IntervalPart = dict[str, tuple[int, int]]
 
 
-def parse_workflow(line: str) -> tuple[str, Workflow]:
-    match = re.match(r"(\w+){(.+)}", line)
-    assert match is not None
-    name = match.group(1)
-    *steps_str, default = match.group(2).split(",")
-    steps = []
-    for step in steps_str:
-        match = re.match(r"(\w+)([<>])(\d+):(\w+)", step)
-        assert match is not None
-        attr, op, value, target = match.groups()
-        steps.append(Step(attr, op, int(value), target))
-    return name, Workflow(steps, default)
+WORKFLOW = record_format("{name:word}{{{steps},{default:word}}}")
+STEP = record_format("{attr:word}{op}{value:int}:{target:word}")
+PART = record_format("{{x={x:int},m={m:int},a={a:int},s={s:int}}}")
 
 
-def parse_part(line: str) -> Part:
-    attrs_str = line[1:-1].split(",")
-    return {k: int(v) for k, v in (attr.split("=") for attr in attrs_str)}
+def parse_workflows(lines: list[str]) -> dict[str, Workflow]:
+    return {
+        name: Workflow([Step(*STEP.match(step)) for step in steps.split(",")], default)
+        for name, steps, default in map(WORKFLOW.match, lines)
+    }
+
+
+def parse_parts(lines: list[str]) -> list[Part]:
+    return [dict(zip(PART.fields, PART.match(line), strict=True)) for line in lines]
 
 
 def is_accepted(workflows: dict[str, Workflow], part: Part) -> bool:
@@ -62,9 +58,9 @@ def is_accepted(workflows: dict[str, Workflow], part: Part) -> bool:
 
 
 def accepted_ratings(s: str) -> int:
-    workflows, parts = paras(s)
-    workflows = dict(parse_workflow(line) for line in workflows)
-    parts = [parse_part(line) for line in parts]
+    workflows_lines, parts_lines = paras(s)
+    workflows = parse_workflows(workflows_lines)
+    parts = parse_parts(parts_lines)
     return sum(attr for p in parts if is_accepted(workflows, p) for attr in p.values())
 
 
@@ -88,7 +84,7 @@ def dc(workflows: dict[str, Workflow], cur: str, part: IntervalPart) -> int:
 
 
 def distinct_combinations(s: str) -> int:
-    workflows = dict(parse_workflow(line) for line in paras(s)[0])
+    workflows = parse_workflows(next(iter_paras(s)))
     return dc(workflows, "in", {attr: (1, 4000) for attr in "xmas"})
 
 
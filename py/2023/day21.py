@@ -2,17 +2,17 @@ from collections import defaultdict
 from itertools import count
 
 from aoc import main
-from aoc.coords import Dir, Grid, Point
+from aoc.coords import Grid, Point
 
 
 class Farm:
     def __init__(self, s: str):
         self.grid = Grid(s)
         self.start = self.grid.find("S")
-        self.walkable = set(self.grid.findall(".")) | {self.start}
+        self.edges = self.grid.edges(lambda a, b: b != "#")
 
-    def __getitem__(self, node: Point) -> set[Point]:
-        return {n for n in Dir.neighbors(node) if n in self.walkable}
+    def __getitem__(self, node: Point) -> tuple[Point, ...]:
+        return self.edges[node]
 
 
 def reachable(s: str, steps: int) -> int:
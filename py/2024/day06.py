@@ -14,7 +14,7 @@ class FoundLoop(Exception):
 
 
 def parse(s: str) -> tuple[Grid[str], State]:
-    grid = Grid(s)
+    grid = Grid(s, dense=True)
     return grid, (grid.find("^"), Dir.N)
 
 
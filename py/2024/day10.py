@@ -1,5 +1,5 @@
 from aoc import main
-from aoc.coords import Dir, Grid, Point
+from aoc.coords import Grid, Point
 from aoc.graph import Edges, shortest_path_length
 
 
@@ -8,9 +8,10 @@ class Map:
         self.grid = Grid(s, int)
         self.trailheads = set(self.grid.findall(0))
         self.trailends = set(self.grid.findall(9))
+        self.edges = self.grid.edges(lambda a, b: b == a + 1)
 
-    def __getitem__(self, p: Point) -> set[Point]:
-        return {n for n in Dir.neighbors(p) if self.grid[p] + 1 == self.grid.get(n)}
+    def __getitem__(self, p: Point) -> tuple[Point, ...]:
+        return self.edges[p]
 
 
 def trail_score(s: str) -> int:
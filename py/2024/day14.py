@@ -5,7 +5,7 @@ from statistics import variance
 
 from aoc import main
 from aoc.coords import Point, Vector, addp
-from aoc.parse import all_numbers, line_parser
+from aoc.parse import all_numbers, line_parser, number_columns
 
 Robot = tuple[Point, Vector]
 
@@ -61,10 +61,14 @@ def easter_egg_orig(s: str, width=101, height=103) -> int:
 # Clever/fast solution using a simplified Chinese Remainder Theorem, found here:
 # <https://www.reddit.com/r/adventofcode/comments/1hdvhvu/comment/m1zws1g/>
 def easter_egg(s: str, width=101, height=103) -> int:
-    robots = parse(s)
-    states = [positions_at(robots, width, height, i) for i in range(max(width, height))]
-    bx = min(range(width), key=lambda t: variance(x for x, y in states[t]))
-    by = min(range(height), key=lambda t: variance(y for x, y in states[t]))
+    # Axes are independent, so each is searched on its own columns of input.
+    px, py, vx, vy = number_columns(s, 4)
+
+    def spread(ps, vs, size: int, t: int) -> float:
+        return variance((p + v * t) % size for p, v in zip(ps, vs, strict=True))
+
+    bx = min(range(width), key=lambda t: spread(px, vx, width, t))
+    by = min(range(height), key=lambda t: spread(py, vy, height, t))
     return bx + ((pow(width, -1, height) * (by - bx)) % height) * width
 
 
@@ -1,5 +1,5 @@
 from aoc import main
-from aoc.coords import Dir, Grid, Point, Vector, addp, turn_left, turn_right
+from aoc.coords import Dir, Grid, Point, Vector, addp, mdist, turn_left, turn_right
 from aoc.graph import Goal, all_shortest_paths, shortest_path_length
 
 type Node = tuple[Point, Vector]
@@ -26,19 +26,21 @@ class Maze:
     def weight(self, a: Node, b: Node) -> int:
         return 1 if a[1] == b[1] else 1001
 
+    def heuristic(self, node: Node) -> int:
+        return mdist(node[0], self.end)
+
 
 def lowest_reindeer_score(s: str) -> int:
     G = Maze(s)
     goal = Goal[Node](lambda node: node[0] == G.end)
-    return shortest_path_length(G, (G.start, Dir.E), goal, weight=G.weight)
+    return shortest_path_length(G, (G.start, Dir.E), goal, G.weight, G.heuristic)
 
 
 def count_best_seats(s: str) -> int:
     G = Maze(s)
     goal = Goal[Node](lambda node: node[0] == G.end)
     seats = set()
-    # TODO: would A* be faster? maybe not, because of dead ends
-    for path in all_shortest_paths(G, (G.start, Dir.E), goal, weight=G.weight):
+    for path in all_shortest_paths(G, (G.start, Dir.E), goal, G.weight, G.heuristic):
         seats |= {p for p, _ in path}
     return len(seats)
 
@@ -1,8 +1,8 @@
-from bisect import bisect_left
 from collections.abc import Iterable
 
 from aoc import main
-from aoc.coords import Dir, Point
+from aoc.collections import first_disconnecting
+from aoc.coords import Dir, Point, mdist_to
 from aoc.graph import shortest_path_length
 from aoc.parse import all_numbers, line_parser
 
@@ -31,17 +31,14 @@ class Memory:
 def minimum_steps(s: str, size: int, first: int) -> int:
     bytes = parse(s)
     start, goal = (0, 0), (size - 1, size - 1)
-    return shortest_path_length(Memory(size, bytes[:first]), start, goal)
+    return shortest_path_length(Memory(size, bytes[:first]), start, goal, heuristic=mdist_to(goal))
 
 
-def first_cutoff_byte(s: str, size: int, first: int) -> str:
+def first_cutoff_byte(s: str, size: int) -> str:
     bytes = parse(s)
-    start, goal = (0, 0), (size - 1, size - 1)
-
-    def bisect_key(i: int) -> bool:
-        return shortest_path_length(Memory(size, bytes[: i + 1]), start, goal) == -1
-
-    i = bisect_left(range(len(bytes)), True, lo=first, key=bisect_key)
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    i = first_disconnecting(cells, bytes, Dir.neighbors, (0, 0), (size - 1, size - 1))
+    assert i is not None
     return f"{bytes[i][0]},{bytes[i][1]}"
 
 
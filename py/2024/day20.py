@@ -1,5 +1,5 @@
 from aoc import main, progress
-from aoc.coords import Dir, Grid, Point, mdist
+from aoc.coords import Grid, Point, mdist
 from aoc.graph import shortest_path_length
 
 
@@ -9,9 +9,10 @@ class Racetrack:
         self.start = self.grid.find("S")
         self.end = self.grid.find("E")
         self.track = set(self.grid.findall(".")) | {self.start, self.end}
+        self.edges = self.grid.edges(lambda a, b: b != "#")
 
-    def __getitem__(self, node: Point) -> set[Point]:
-        return {n for n in Dir.neighbors(node) if n in self.track}
+    def __getitem__(self, node: Point) -> tuple[Point, ...]:
+        return self.edges[node]
 
 
 def cheat_neighbors(p: Point, max: int) -> set[Point]:
@@ -2,7 +2,7 @@ from collections import defaultdict
 from itertools import pairwise
 
 from aoc import main, progress
-from aoc.parse import all_numbers
+from aoc.parse import iter_numbers
 from aoc.util import sliding_window
 
 
@@ -14,7 +14,7 @@ def next_secret(n: int) -> int:
 
 def sum_of_secrets(s: str) -> int:
     total = 0
-    for n in all_numbers(s):
+    for n in iter_numbers(s):
         for _ in range(2000):
             n = next_secret(n)
         total += n
@@ -23,7 +23,7 @@ def sum_of_secrets(s: str) -> int:
 
 def best_sequence_of_changes(s: str) -> int:
     running_total = defaultdict(int)
-    for n in progress(all_numbers(s)):
+    for n in progress(iter_numbers(s)):
         values = [n % 10]
         for _ in range(2000):
             n = next_secret(n)
@@ -1,16 +1,15 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from itertools import accumulate
 from typing import Literal
 
 from aoc import main
-from aoc.parse import first_number, line_parser
+from aoc.parse import first_number, iter_lines
 
 type Rotation = tuple[Literal[1] | Literal[-1], int]
 
 
-@line_parser
-def parse(line: str) -> Rotation:
-    return (1 if line[0] == "R" else -1, first_number(line))
+def parse(s: str) -> Iterator[Rotation]:
+    return ((1 if line[0] == "R" else -1, first_number(line)) for line in iter_lines(s))
 
 
 def count_zeroes(states: Iterable[int], start=50, size=100) -> int:
@@ -18,11 +17,11 @@ def count_zeroes(states: Iterable[int], start=50, size=100) -> int:
 
 
 def turns(rotations: Iterable[Rotation]) -> Iterable[int]:
-    return [delta * distance for delta, distance in rotations]
+    return (delta * distance for delta, distance in rotations)
 
 
 def clicks(rotations: Iterable[Rotation]) -> Iterable[int]:
-    return [delta for delta, distance in rotations for _ in range(distance)]
+    return (delta for delta, distance in rotations for _ in range(distance))
 
 
 if __name__ == "__main__":
@@ -1,28 +1,28 @@
 from aoc import main
-from aoc.coords import Dir8, Grid, Point
+from aoc.bitgrid import BitGrid
+from aoc.coords import Grid
 
 
-def accessible_rolls(rolls: set[Point]) -> set[Point]:
-    def neighbor_rolls(p: Point) -> list[Point]:
-        return [n for n in Dir8.neighbors(p) if n in rolls]
+def parse(s: str) -> tuple[BitGrid, int]:
+    grid = Grid(s)
+    B = BitGrid(grid.width, grid.height)
+    return B, B.mask(grid.findall("@"))
 
-    return {p for p in rolls if len(neighbor_rolls(p)) < 4}
 
+def accessible_rolls(B: BitGrid, rolls: int) -> int:
+    return rolls & ~B.count_at_least(rolls, 4, diagonal=True)
 
-def removable_rolls(rolls: set[Point]) -> set[Point]:
-    to_remove = None
-    removed = set()
-    while True:
-        to_remove = accessible_rolls(rolls)
-        if not to_remove:
-            break
-        rolls -= to_remove
+
+def removable_rolls(B: BitGrid, rolls: int) -> int:
+    removed = 0
+    while to_remove := accessible_rolls(B, rolls):
+        rolls &= ~to_remove
         removed |= to_remove
     return removed
 
 
 if __name__ == "__main__":
     main(
-        lambda s: len(accessible_rolls(set(Grid(s).findall("@")))),
-        lambda s: len(removable_rolls(set(Grid(s).findall("@")))),
+        lambda s: accessible_rolls(*parse(s)).bit_count(),
+        lambda s: removable_rolls(*parse(s)).bit_count(),
     )
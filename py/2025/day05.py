@@ -1,23 +1,27 @@
 from aoc import main
-from aoc.collections import Range
+from aoc.collections import IntervalSet
 from aoc.parse import paras
 
 
-def parse(input: str) -> tuple[list[Range], list[int]]:
+def parse(input: str) -> tuple[IntervalSet, list[int]]:
     ranges_str, ids_str = paras(input)
-    ranges = Range.union(*[Range.from_str(r) for r in ranges_str])
+    bounds = []
+    for r in ranges_str:
+        a, b = map(int, r.split("-"))
+        bounds.append((a, b))
+    ranges = IntervalSet(bounds)
     ids = [int(n) for n in ids_str]
     return ranges, ids
 
 
 def count_fresh_ingredients(input: str):
     ranges, ids = parse(input)
-    return sum(1 for id in ids if any(id in r for r in ranges))
+    return ranges.count_contained(ids)
 
 
 def count_fresh_ids(input: str):
     ranges, _ = parse(input)
-    return sum(len(r) for r in ranges)
+    return len(ranges)
 
 
 if __name__ == "__main__":
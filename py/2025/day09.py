@@ -1,14 +1,8 @@
 from itertools import combinations, pairwise
 
 from aoc import main
-from aoc.collections import SummedAreaTable
-from aoc.coords import (
-    Dir,
-    Point,
-    area,
-    find_bounds,
-    line_between,
-)
+from aoc.bitgrid import BitGrid
+from aoc.coords import CompressedPlane, Point, area, line_between
 from aoc.parse import all_numbers, line_parser
 
 
@@ -23,53 +17,33 @@ def largest_rectangle(input: str) -> int:
     return max(area(a, b) for a, b in combinations(red_tiles, 2))
 
 
-def compress(points: list[Point]) -> dict[Point, Point]:
-    uniq_x = list(sorted({p[0] for p in points}))
-    uniq_y = list(sorted({p[1] for p in points}))
-    x_map = {x: i for i, x in enumerate(uniq_x)}
-    y_map = {y: i for i, y in enumerate(uniq_y)}
-    return {(x, y): (x_map[x], y_map[y]) for x, y in points}
-
-
 def largest_contained_rectangle(input: str):
     red_tiles = parse(input)
-    to_compressed = compress(red_tiles)
+    plane = CompressedPlane(red_tiles)
+    to_compressed = {p: plane.compress(p) for p in red_tiles}
     compressed_tiles = list(to_compressed.values())
-    is_outside: dict[Point, bool] = {p: False for p in compressed_tiles}
-
-    # mark the border as known-inside for flood fill
-    for a, b in pairwise([compressed_tiles[-1], *compressed_tiles]):
-        for p in line_between(a, b):
-            is_outside[p] = False
 
     # flood fill the outside; centroid to fill inside doesn't work due to the concave shape.
-    # include a guaranteed-empty border so flood doesn't get stuck
-    (minx, miny), (maxx, maxy) = find_bounds(compressed_tiles)
-    minx, miny = minx - 1, miny - 1
-    maxx, maxy = maxx + 1, maxy + 1
-
-    # TODO is there a cleaner way?
-    def in_grid(p: Point) -> bool:
-        return minx <= p[0] <= maxx and miny <= p[1] <= maxy
-
-    queue = {(minx, miny)}
-    while queue:
-        cur = queue.pop()
-        if cur in is_outside:
-            continue
-        is_outside[cur] = True
-        queue |= {n for n in Dir.neighbors(cur) if in_grid(n)}
-
-    inside_area = SummedAreaTable(
-        maxx,
-        maxy,
-        lambda p: 0 if is_outside.get(p) else 1,
+    # include a guaranteed-empty margin so flood doesn't get stuck
+    B = BitGrid(plane.width + 2, plane.height + 2)
+    border = B.mask(
+        (x + 1, y + 1)
+        for a, b in pairwise([compressed_tiles[-1], *compressed_tiles])
+        for x, y in line_between(a, b)
     )
+    outside, grown = 0, B.bit((0, 0))
+    while grown != outside:
+        outside, grown = grown, B.spread(grown) & ~border
+    inside = {(x - 1, y - 1) for x, y in B.points(B.cells & ~outside)}
+
+    # Weighted by cell size, so sums count real tiles.
+    inside_area = plane.summed_area(lambda p: p in inside)
 
+    pairs = list(combinations(red_tiles, 2))
+    compressed_pairs = [(to_compressed[a], to_compressed[b]) for a, b in pairs]
     max_area = 0
-    for a, b in combinations(red_tiles, 2):
-        ca, cb = to_compressed[a], to_compressed[b]
-        if area(ca, cb) == inside_area[ca, cb]:
+    for (a, b), tiles in zip(pairs, inside_area.query_many(compressed_pairs), strict=True):
+        if area(a, b) == tiles:
             max_area = max(max_area, area(a, b))
     return max_area
 
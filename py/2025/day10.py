@@ -4,23 +4,22 @@ from itertools import product
 from aoc import main, progress
 from aoc.collections import Bitmask
 from aoc.graph import shortest_path_length
-from aoc.linalg import to_reduced_row_echelon_form
-from aoc.parse import all_numbers, line_parser
+from aoc.linalg import fraction_free_rref_many
+from aoc.parse import all_numbers, records
 
-SCHEMATIC_RE = re.compile(r"^\[([.#]+)] (\(.*\)) {(.*)}")
+SCHEMATIC = "[{lights}] {buttons} {{{joltages:ints}}}"
 BUTTONS_RE = re.compile(r"\(([\d,]+)\)")
 
 
-@line_parser
-def parse(line: str):
-    match = SCHEMATIC_RE.match(line)
-    if not match:
-        raise ValueError
-    lights_str, buttons_str, joltages_str = match.groups()
-    lights = {i for i, v in enumerate(lights_str) if v == "#"}
-    buttons = [all_numbers(b) for b in BUTTONS_RE.findall(buttons_str)]
-    joltages = all_numbers(joltages_str)
-    return lights, buttons, joltages
+def parse(s: str):
+    return [
+        (
+            {i for i, v in enumerate(lights_str) if v == "#"},
+            [all_numbers(b) for b in BUTTONS_RE.findall(buttons_str)],
+            joltages,
+        )
+        for lights_str, buttons_str, joltages in records(SCHEMATIC, s)
+    ]
 
 
 class OfflineMachine:
@@ -40,27 +39,28 @@ def fewest_presses_lights(input: str):
     return total
 
 
+def joltage_system(buttons: list[list[int]], joltages: list[int]) -> list[list[int]]:
+    matrix = []
+    for joltage_index, joltage in enumerate(joltages):
+        row = [0] * len(buttons) + [joltage]
+        for button_index, button in enumerate(buttons):
+            if joltage_index in button:
+                row[button_index] = 1
+        matrix.append(row)
+    return matrix
+
+
 def fewest_presses_joltages(input: str):
     machines = parse(input)
+    systems = fraction_free_rref_many(joltage_system(b, j) for _, b, j in machines)
     overall_total = 0
 
-    for _lights, buttons, joltages in progress(machines):
-        matrix = []
-        for joltage_index, joltage in enumerate(joltages):
-            row = [0] * len(buttons) + [joltage]
-            for button_index, button in enumerate(buttons):
-                if joltage_index in button:
-                    row[button_index] = 1
-            matrix.append(row)
-        rref = to_reduced_row_echelon_form(matrix)
-        rref = [[float(x) for x in row] for row in rref]
-
+    for (_lights, buttons, joltages), system in progress(zip(machines, systems, strict=True)):
         coeff_count = len(buttons)
-        pivot_rows: dict[int, int] = {}
-        for i, row in enumerate(rref):
-            if 1 in row:
-                pivot_rows[row.index(1)] = i
-        free_cols = [col for col in range(coeff_count) if col not in pivot_rows]
+        # Pivots are all `denominator`, so pivot variables come out as exact quotients.
+        denominator = system.denominator
+        pivot_rows = {col: system.matrix[i] for i, col in enumerate(system.pivots)}
+        free_cols = system.free
         max_presses_for = {i: min(joltages[b] for b in buttons[i]) for i in range(len(buttons))}
 
         def compute_solution(free_values: tuple[int, ...]) -> list[int] | None:
@@ -68,12 +68,14 @@ def fewest_presses_joltages(input: str):
             for i, col in enumerate(free_cols):
                 solution[col] = free_values[i]
             for col, row in pivot_rows.items():
-                val = rref[row][-1] - sum(
-                    rref[row][free_cols[i]] * free_values[i] for i in range(len(free_cols))
+                val, remainder = divmod(
+                    row[-1]
+                    - sum(row[free_cols[i]] * free_values[i] for i in range(len(free_cols))),
+                    denominator,
                 )
-                if abs(val - round(val)) > 1e-9 or not 0 <= val <= max_presses_for[col]:
+                if remainder or not 0 <= val <= max_presses_for[col]:
                     return None
-                solution[col] = int(val)
+                solution[col] = val
                 if min_sum and sum(solution) >= min_sum:
                     return None
             return solution
@@ -3,8 +3,11 @@ import inspect
 import json
 import pstats
 import sys
+import threading
 import time
 import traceback
+import tracemalloc
+from collections import Counter
 from collections.abc import Callable, Generator, Iterable
 from itertools import count
 from pathlib import Path
@@ -12,6 +15,8 @@ from typing import Any
 
 from websockets.sync.client import connect
 
+from aoc.util import format_bytes
+
 
 class ResultsEncoder(json.JSONEncoder):
     def default(self, o):
@@ -32,22 +37,26 @@ def _find_day_file():
     raise RuntimeError("no day file found in stack")
 
 
+def _location(file_name: str, line_number: int, src_path: Path) -> str:
+    name = Path(file_name)
+    if file_name == "~":
+        return file_name
+    if name == src_path:
+        return str(line_number)
+    base_dir = Path(__file__).parent.parent
+    if name.is_relative_to(base_dir):
+        name = name.relative_to(base_dir)
+    else:
+        lib = next((d for d in sys.path if name.is_relative_to(d)), None)
+        if lib:
+            name = "/" / name.relative_to(lib)
+    return f"{name}:{line_number}"
+
+
 def create_profile_table(profile: cProfile.Profile, src_path: Path):
     def line(p: pstats.FunctionProfile):
-        name = Path(p.file_name)
-        if p.file_name == "~":
-            return p.file_name
-        if name == src_path:
-            return str(p.line_number)
-        if name.is_relative_to(base_dir):
-            name = name.relative_to(base_dir)
-        else:
-            lib = next((d for d in sys.path if name.is_relative_to(d)), None)
-            if lib:
-                name = "/" / name.relative_to(lib)
-        return f"{name}:{p.line_number}"
+        return _location(p.file_name, p.line_number, src_path)
 
-    base_dir = Path(__file__).parent.parent
     profile.create_stats()
     profiles = pstats.Stats(profile).get_stats_profile().func_profiles
     items = sorted(profiles.items(), key=lambda np: (np[1].tottime, np[1].ncalls), reverse=True)
@@ -58,6 +67,120 @@ def create_profile_table(profile: cProfile.Profile, src_path: Path):
     }
 
 
+class MemoryProfile:
+    """Peak traced memory, and a snapshot of allocations taken close to it.
+
+    Most of a solver's memory is freed by the time it returns, so a thread
+    takes a fresh snapshot whenever usage grows past the last one.
+    """
+
+    interval = 0.01
+    peak: int
+    snapshot: tracemalloc.Snapshot | None
+
+    def __init__(self) -> None:
+        self.peak = 0
+        self.snapshot = None
+        self._size = 0
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def enable(self) -> None:
+        tracemalloc.start()
+        self._sampler.start()
+
+    def disable(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+        current, self.peak = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self._size:
+            self.snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self._size * 1.1:
+                self.snapshot = tracemalloc.take_snapshot()
+                self._size = current
+
+
+def create_memory_table(profile: MemoryProfile, src_path: Path):
+    assert profile.snapshot is not None
+    ignore = [tracemalloc.__file__, threading.__file__]
+    snapshot = profile.snapshot.filter_traces([tracemalloc.Filter(False, f) for f in ignore])
+    rows = []
+    for stat in snapshot.statistics("lineno")[:5]:
+        frame = stat.traceback[0]
+        line = _location(frame.filename, frame.lineno, src_path)
+        rows.append([line, format_bytes(stat.size), str(stat.count)])
+    rows.append(["peak", format_bytes(profile.peak), ""])
+    return {"header": ["line", "size", "blocks"], "rows": rows}
+
+
+class SamplingProfile:
+    """Call stacks of the current thread, sampled from another one.
+
+    Much cheaper than cProfile for call-heavy solvers, so timings stay honest.
+    Samples can only be taken when the solver gives up the GIL, so the real
+    interval is at least sys.getswitchinterval() (5ms by default).
+    """
+
+    interval = 0.001
+    stacks: Counter[tuple[tuple[str, int, str], ...]]
+    lines: Counter[tuple[str, int, str]]
+
+    def __init__(self) -> None:
+        self.stacks = Counter()
+        self.lines = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def enable(self) -> None:
+        self._sampler.start()
+
+    def disable(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None and frame.f_code is not run_solver.__code__:
+                stack.append(frame)
+                frame = frame.f_back
+            # Only count samples taken while the solver itself was running.
+            if frame is None or not stack:
+                continue
+            code = stack[0].f_code
+            self.lines[code.co_filename, stack[0].f_lineno, code.co_name] += 1
+            key = tuple(
+                (f.f_code.co_filename, f.f_code.co_firstlineno, f.f_code.co_name) for f in stack
+            )
+            self.stacks[key[::-1]] += 1
+
+    def write_folded(self, path: Path, src_path: Path) -> None:
+        """Write collapsed stacks, as read by flamegraph.pl and speedscope."""
+        with open(path, "w") as f:
+            for stack, n in self.stacks.items():
+                names = (
+                    f"{name} ({_location(file, line, src_path)})" for file, line, name in stack
+                )
+                f.write(f"{';'.join(names)} {n}\n")
+
+
+def create_samples_table(profile: SamplingProfile, src_path: Path, out: Path):
+    total = profile.lines.total()
+    rows = [
+        [_location(file, line, src_path), name, f"{n / total:.0%}"]
+        for (file, line, name), n in profile.lines.most_common(5)
+    ]
+    rows.append(["", f"{total} samples in {out}", ""])
+    return {"header": ["line", "function", "samples"], "rows": rows}
+
+
 def run_solver(fn, input, **kwargs):
     response = {}
     start = time.perf_counter()
@@ -70,49 +193,117 @@ def run_solver(fn, input, **kwargs):
     return response
 
 
+def run_profiled(fn, input, part: int, cpu: bool, memory: bool, sampled: bool, **kwargs):
+    prof = cProfile.Profile() if cpu else None
+    mem = MemoryProfile() if memory else None
+    samples = SamplingProfile() if sampled else None
+    for p in (mem, samples, prof):
+        if p:
+            p.enable()
+    response = run_solver(fn, input, **kwargs)
+    for p in (prof, samples, mem):
+        if p:
+            p.disable()
+    src_path = _find_day_file()
+    asides = []
+    if prof:
+        asides.append(create_profile_table(prof, src_path))
+    if mem:
+        asides.append(create_memory_table(mem, src_path))
+    if samples:
+        out = src_path.with_name(f"{src_path.stem}.part{part}.folded")
+        samples.write_folded(out, src_path)
+        asides.append(create_samples_table(samples, src_path, out))
+    response["aside"] = asides[0] if len(asides) == 1 else asides
+    return response
+
+
+def run_benchmark(fn, input, runs: int, warmup: int = 0, **kwargs):
+    if runs < 1:
+        raise ValueError("benchmarks need at least one run")
+    durations = []
+    response = {}
+    for i in range(warmup + runs):
+        response = run_solver(fn, input, **kwargs)
+        if "error" in response:
+            return response
+        if i >= warmup:
+            durations.append(response["duration"])
+    # Tracing slows everything down, so peak memory gets a run of its own.
+    tracemalloc.start()
+    try:
+        fn(input, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    response["duration"] = sorted(durations)[len(durations) // 2]
+    response["bench"] = {"durations": durations, "peak": peak}
+    return response
+
+
 _websocket = None
+# Set by aoc.worker so days it runs share its connection instead of opening one.
+_worker = None
 
 
-def main(*fns: Callable[..., Any], profile: int = -1, isolate: int | None = None):
-    global _websocket
+def main(
+    *fns: Callable[..., Any],
+    profile: int = -1,
+    memprofile: int = -1,
+    sample: int = -1,
+    isolate: int | None = None,
+):
     try:
-        if len(sys.argv) == 1:
+        if _worker is not None:
+            _serve(_worker, fns, profile, memprofile, sample, isolate)
+        elif len(sys.argv) == 1:
             input = sys.stdin.read()
             for fn in fns:
                 print(fn(input))
         else:
             with connect(sys.argv[1]) as websocket:
-                _websocket = websocket
-                for msg_index in count():
-                    msg = json.loads(websocket.recv())
-                    if msg.get("done"):
-                        break
-                    input, args, part = msg["input"], msg["args"], msg.get("part")
-                    for i, fn in enumerate(fns):
-                        if part and i + 1 != part:
-                            continue
-                        if isolate is not None and isolate != msg_index:
-                            websocket.send(json.dumps({"answer": "skipped", "duration": 0}))
-                            continue
-                        sig = inspect.signature(fn)
-                        kwargs: dict[str, Any] = {
-                            k: v for k, v in args.items() if k in sig.parameters
-                        }
-                        if profile == i:
-                            prof = cProfile.Profile()
-                            prof.enable()
-                            response = run_solver(fn, input, **kwargs)
-                            prof.disable()
-                            response["aside"] = create_profile_table(prof, _find_day_file())
-                        else:
-                            response = run_solver(fn, input, **kwargs)
-                        websocket.send(json.dumps(response, cls=ResultsEncoder))
-                    websocket.send(json.dumps({"done": True}, cls=ResultsEncoder))
-                _websocket = None
+                _serve(websocket, fns, profile, memprofile, sample, isolate)
     except KeyboardInterrupt:
         pass
 
 
+def _serve(
+    websocket,
+    fns: tuple[Callable[..., Any], ...],
+    profile: int,
+    memprofile: int,
+    sample: int,
+    isolate: int | None,
+):
+    global _websocket
+    _websocket = websocket
+    for msg_index in count():
+        msg = json.loads(websocket.recv())
+        if msg.get("done"):
+            break
+        input, args, part = msg["input"], msg["args"], msg.get("part")
+        bench = msg.get("bench")
+        for i, fn in enumerate(fns):
+            if part and i + 1 != part:
+                continue
+            if isolate is not None and isolate != msg_index:
+                websocket.send(json.dumps({"answer": "skipped", "duration": 0}))
+                continue
+            sig = inspect.signature(fn)
+            kwargs: dict[str, Any] = {k: v for k, v in args.items() if k in sig.parameters}
+            if i in (profile, memprofile, sample):
+                response = run_profiled(
+                    fn, input, i + 1, profile == i, memprofile == i, sample == i, **kwargs
+                )
+            elif bench:
+                response = run_benchmark(fn, input, bench["runs"], bench.get("warmup", 0), **kwargs)
+            else:
+                response = run_solver(fn, input, **kwargs)
+            websocket.send(json.dumps(response, cls=ResultsEncoder))
+        websocket.send(json.dumps({"done": True}, cls=ResultsEncoder))
+    _websocket = None
+
+
 def status(msg: str) -> None:
     if _websocket is not None:
         _websocket.send(json.dumps({"status": msg}))
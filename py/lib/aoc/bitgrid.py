@@ -0,0 +1,124 @@
+"""
+Grid occupancy as the bits of one big int, for cellular automata.
+
+A BitGrid describes the geometry; the occupancy masks themselves are plain ints,
+so a whole generation is a handful of shifts, ANDs and ORs over every cell at
+once rather than a set lookup per cell and neighbor.
+
+Cell (x, y) is bit `y * stride + x`. Each row is followed by a guard bit that
+is always clear, so a mask shifted by one column and ANDed with `cells` loses
+the cells that went off the edge rather than wrapping them onto the next row.
+"""
+
+from collections.abc import Iterable, Iterator
+
+from aoc.coords import Dir, Dir8, Point, Vector
+
+
+class BitGrid:
+    width: int
+    height: int
+    stride: int
+    cells: int  # every cell in the grid
+    border: int  # the cells in the outermost rows and columns
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.stride = width + 1
+        # One bit at the start of every row; multiplying by a row's bits
+        # repeats them down the grid (they never overlap, so nothing carries).
+        self._row_starts = sum(1 << (y * self.stride) for y in range(height))
+        self.cells = self.columns(0, width)
+        self.border = (
+            self.columns(0, 1)
+            | self.columns(width - 1, width)
+            | self.rows(0, 1)
+            | self.rows(height - 1, height)
+        )
+
+    def columns(self, start: int, stop: int) -> int:
+        """The cells with start <= x < stop."""
+        return self._row_starts * (((1 << (stop - start)) - 1) << start)
+
+    def rows(self, start: int, stop: int) -> int:
+        """The cells with start <= y < stop."""
+        return self.cells & ((1 << (stop * self.stride)) - (1 << (start * self.stride)))
+
+    def bit(self, p: Point) -> int:
+        x, y = p
+        return 1 << (y * self.stride + x)
+
+    def mask(self, points: Iterable[Point]) -> int:
+        bits = bytearray(b"0" * (self.height * self.stride))
+        for x, y in points:
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise ValueError(f"{(x, y)} is outside the grid")
+            bits[y * self.stride + x] = ord("1")
+        bits.reverse()
+        return int(bits, 2)
+
+    def points(self, mask: int) -> Iterator[Point]:
+        bits = bin(mask)[:1:-1]  # least significant first
+        i = bits.find("1")
+        while i >= 0:
+            y, x = divmod(i, self.stride)
+            yield x, y
+            i = bits.find("1", i + 1)
+
+    def shift(self, mask: int, dx: int = 0, dy: int = 0) -> int:
+        """Move every cell of mask by (dx, dy); cells that leave the grid are lost."""
+        if abs(dx) >= self.width or abs(dy) >= self.height:
+            return 0
+        # The guard bits make one-column shifts a shift and a mask.
+        if dx == 1:
+            mask = (mask << 1) & self.cells
+        elif dx == -1:
+            mask = (mask >> 1) & self.cells
+        elif dx > 0:
+            mask = (mask & self.columns(0, self.width - dx)) << dx
+        elif dx < 0:
+            mask = (mask & self.columns(-dx, self.width)) >> -dx
+        if dy > 0:
+            mask = (mask << (dy * self.stride)) & self.cells
+        elif dy < 0:
+            mask >>= -dy * self.stride
+        return mask
+
+    def roll(self, mask: int, dx: int = 0, dy: int = 0) -> int:
+        """Move every cell of mask by (dx, dy), wrapping around the grid's edges."""
+        if dx := dx % self.width:
+            split = self.width - dx
+            mask = ((mask & self.columns(0, split)) << dx) | (
+                (mask & self.columns(split, self.width)) >> split
+            )
+        if dy := dy % self.height:
+            split = self.height - dy
+            mask = ((mask & self.rows(0, split)) << (dy * self.stride)) | (
+                mask >> (split * self.stride)
+            )
+        return mask
+
+    def neighbors(self, mask: int, *, diagonal: bool = False) -> list[int]:
+        """For each direction d, the cells whose neighbor in direction d is in mask."""
+        return [self.shift(mask, -dx, -dy) for dx, dy in self._dirs(diagonal)]
+
+    def spread(self, mask: int, *, diagonal: bool = False) -> int:
+        """The cells in mask, plus every cell next to one."""
+        spread = mask
+        for dx, dy in self._dirs(diagonal):
+            spread |= self.shift(mask, dx, dy)
+        return spread
+
+    def count_at_least(self, mask: int, n: int, *, diagonal: bool = False) -> int:
+        """The cells (occupied or not) with at least n neighbors in mask."""
+        # at_least[k] holds the cells with k or more neighbors seen so far.
+        at_least = [self.cells] + [0] * n
+        for near in self.neighbors(mask, diagonal=diagonal):
+            for k in range(n, 0, -1):
+                at_least[k] |= at_least[k - 1] & near
+        return at_least[n]
+
+    @staticmethod
+    def _dirs(diagonal: bool) -> list[Vector]:
+        return list(Dir8 if diagonal else Dir)
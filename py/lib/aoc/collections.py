@@ -1,9 +1,13 @@
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from itertools import accumulate
+from operator import add
 from typing import Callable, Self
 
-from aoc.coords import Point, Rect
+from aoc.coords import Grid, Point, Rect
 
 
 class Bitmask(int):
@@ -38,40 +42,131 @@ class Bitmask(int):
 
 
 # <https://en.wikipedia.org/wiki/Disjoint-set_data_structure>
-class DisjointSet[T]:
-    def __init__(self, xs: list[T]) -> None:
-        self._parent = {x: x for x in xs}
-        self._size = {x: 1 for x in xs}
-        self._count = len(xs)
+class IntDisjointSet:
+    """Disjoint sets over the integers 0..n-1, backed by flat arrays."""
+
+    def __init__(self, n: int) -> None:
+        self._parent = array("i", range(n))
+        self._size = array("i", [1]) * n
+        self._count = n
 
     def __len__(self) -> int:
         return self._count
 
-    def root(self, x: T) -> T:
-        if self._parent[x] != x:
-            self._parent[x] = self.root(self._parent[x])  # compress paths
-        return self._parent[x]
+    def root(self, x: int) -> int:
+        parent = self._parent
+        while parent[x] != x:
+            grandparent = parent[parent[x]]
+            parent[x] = grandparent  # halve paths as we go
+            x = grandparent
+        return x
 
-    def union(self, a: T, b: T) -> None:
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets containing a and b; False if they were already one."""
         root_a = self.root(a)
         root_b = self.root(b)
         if root_a == root_b:
-            return
+            return False
         self._count -= 1
-        if self._size[root_b] > self._size[root_a]:  # merge into largest
+        size = self._size
+        if size[root_b] > size[root_a]:  # merge into largest
             root_a, root_b = root_b, root_a
         self._parent[root_b] = root_a
-        self._size[root_a] += self._size[root_b]
+        size[root_a] += size[root_b]
+        return True
 
-    def components(self) -> list[set[T]]:
-        components: dict[T, set[T]] = defaultdict(set)
-        for x in self._parent:
-            components[self.root(x)].add(x)
+    def union_many(self, pairs: Iterable[tuple[int, int]]) -> None:
+        union = self.union
+        for a, b in pairs:
+            union(a, b)
+
+    def components(self) -> list[list[int]]:
+        components: dict[int, list[int]] = defaultdict(list)
+        root = self.root
+        for x in range(len(self._parent)):
+            components[root(x)].append(x)
         return list(components.values())
 
     def sizes(self) -> list[int]:
-        roots = {self.root(p) for p in self._parent}
-        return [self._size[root] for root in roots]
+        # Roots are exactly the elements that are their own parent.
+        size = self._size
+        return [size[x] for x, p in enumerate(self._parent) if x == p]
+
+
+class DisjointSet[T]:
+    """Disjoint sets over arbitrary hashable items.
+
+    Items are mapped to indexes once, up front; the work happens in an
+    IntDisjointSet.
+    """
+
+    def __init__(self, xs: Iterable[T]) -> None:
+        self._items = list(dict.fromkeys(xs))
+        self._index = {x: i for i, x in enumerate(self._items)}
+        self._sets = IntDisjointSet(len(self._items))
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def root(self, x: T) -> T:
+        return self._items[self._sets.root(self._index[x])]
+
+    def union(self, a: T, b: T) -> bool:
+        """Merge the sets containing a and b; False if they were already one."""
+        return self._sets.union(self._index[a], self._index[b])
+
+    def union_many(self, pairs: Iterable[tuple[T, T]]) -> None:
+        index = self._index
+        self._sets.union_many((index[a], index[b]) for a, b in pairs)
+
+    def components(self) -> list[set[T]]:
+        items = self._items
+        return [{items[x] for x in component} for component in self._sets.components()]
+
+    def sizes(self) -> list[int]:
+        return self._sets.sizes()
+
+
+def first_disconnecting[T](
+    nodes: Iterable[T],
+    blockers: Sequence[T],
+    neighbors: Callable[[T], Iterable[T]],
+    start: T,
+    goal: T,
+) -> int | None:
+    """Index of the first blocker that cuts start off from goal, or None.
+
+    Blockers are removed from the open nodes one at a time, in order. Rather
+    than searching after every removal, this starts from the fully-blocked
+    state and reopens blockers in reverse, unioning each with its open
+    neighbors until start and goal join up.
+    """
+    first_index: dict[T, int] = {}
+    for i, b in enumerate(blockers):
+        first_index.setdefault(b, i)
+    nodes = list(nodes)
+    is_open = {n: n not in first_index for n in nodes}
+    ds = DisjointSet(nodes)
+
+    def reopen(n: T) -> None:
+        is_open[n] = True
+        for neighbor in neighbors(n):
+            if is_open.get(neighbor):
+                ds.union(n, neighbor)
+
+    for n in nodes:
+        if is_open[n]:
+            reopen(n)
+    if start not in is_open or goal not in is_open or ds.root(start) == ds.root(goal):
+        return None
+    for i in reversed(range(len(blockers))):
+        b = blockers[i]
+        if first_index[b] != i or b not in is_open:
+            continue
+        reopen(b)
+        if ds.root(start) == ds.root(goal):
+            return i
+    return None
 
 
 # Facilitates greedy interval merging.
@@ -87,16 +182,8 @@ class Range:
 
     @classmethod
     def union(cls, *ranges: Self) -> list[Self]:
-        if not ranges:
-            return []
-        first, *sorted_ranges = sorted(ranges)
-        union = [cls(first.start, first.end)]
-        for cur in sorted_ranges:
-            try:
-                union[-1] |= cur
-            except ValueError:
-                union.append(cls(cur.start, cur.end))
-        return union
+        merged = IntervalSet((r.start, r.end) for r in ranges)
+        return [cls(start, end) for start, end in merged.intervals()]
 
     def __lt__(self, other: Self) -> bool:
         return self.start < other.start
@@ -117,26 +204,235 @@ class Range:
         return self.start <= other.end + adj and other.start <= self.end + adj
 
 
+class IntervalSet:
+    """A set of integers, stored as sorted, disjoint, inclusive intervals.
+
+    Overlapping and adjacent intervals are merged on construction, so `starts`
+    and `ends` are both strictly increasing and membership is a binary search.
+    Sets are immutable; the operators return new ones.
+    """
+
+    starts: array[int]
+    ends: array[int]
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()) -> None:
+        starts = self.starts = array("q")
+        ends = self.ends = array("q")
+        for start, end in sorted(intervals):
+            if end < start:
+                continue
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+
+    def intervals(self) -> list[tuple[int, int]]:
+        return list(zip(self.starts, self.ends, strict=True))
+
+    def __contains__(self, x: int, /) -> bool:
+        i = bisect_right(self.starts, x) - 1
+        return i >= 0 and x <= self.ends[i]
+
+    def count_contained(self, xs: Iterable[int]) -> int:
+        """How many of xs (counting repeats) are in the set."""
+        xs = sorted(xs)
+        return sum(
+            bisect_right(xs, end) - bisect_left(xs, start)
+            for start, end in zip(self.starts, self.ends, strict=True)
+        )
+
+    def __len__(self) -> int:
+        return sum(self.ends) - sum(self.starts) + len(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.intervals()!r})"
+
+    def shift(self, delta: int) -> Self:
+        return self.__class__((start + delta, end + delta) for start, end in self.intervals())
+
+    def __or__(self, other: Self) -> Self:
+        return self.__class__(self.intervals() + other.intervals())
+
+    def __and__(self, other: Self) -> Self:
+        a, b = self.intervals(), other.intervals()
+        overlaps = []
+        i = j = 0
+        while i < len(a) and j < len(b):
+            (a_start, a_end), (b_start, b_end) = a[i], b[j]
+            if max(a_start, b_start) <= min(a_end, b_end):
+                overlaps.append((max(a_start, b_start), min(a_end, b_end)))
+            # Whichever interval ends first can't overlap anything further on.
+            if a_end < b_end:
+                i += 1
+            else:
+                j += 1
+        return self.__class__(overlaps)
+
+    def __sub__(self, other: Self) -> Self:
+        b = other.intervals()
+        remaining = []
+        j = 0
+        for start, end in self.intervals():
+            while j < len(b) and b[j][1] < start:
+                j += 1
+            k = j
+            while k < len(b) and b[k][0] <= end:
+                if b[k][0] > start:
+                    remaining.append((start, b[k][0] - 1))
+                start = b[k][1] + 1
+                k += 1
+            if start <= end:
+                remaining.append((start, end))
+        return self.__class__(remaining)
+
+
+class OffsetMap:
+    """A piecewise map on the integers that adds a constant to each segment.
+
+    Integers outside every segment map to themselves. The map is stored as
+    sorted breakpoints: offsets[i] applies from bounds[i - 1] (inclusive) up to
+    bounds[i], with the first and last offsets covering everything below and
+    above. Chains of maps can be fused with `then` and applied in one pass.
+    """
+
+    bounds: array[int]
+    offsets: array[int]
+
+    def __init__(self, segments: Iterable[tuple[int, int, int]] = ()) -> None:
+        """Segments are non-overlapping (start, end, offset), with inclusive ends."""
+        bounds: list[int] = []
+        offsets = [0]
+        for start, end, offset in sorted(segments):
+            if end < start:
+                continue
+            if bounds and start < bounds[-1]:
+                raise ValueError("segments must not overlap")
+            if bounds and start == bounds[-1]:
+                offsets[-1] = offset
+            else:
+                bounds.append(start)
+                offsets.append(offset)
+            bounds.append(end + 1)
+            offsets.append(0)
+        self._set(bounds, offsets)
+
+    def _set(self, bounds: list[int], offsets: list[int]) -> None:
+        # Drop breakpoints that don't change the offset.
+        self.bounds = array("q")
+        self.offsets = array("q", offsets[:1])
+        for bound, offset in zip(bounds, offsets[1:], strict=True):
+            if offset != self.offsets[-1]:
+                self.bounds.append(bound)
+                self.offsets.append(offset)
+
+    def __call__(self, x: int) -> int:
+        return x + self.offsets[bisect_right(self.bounds, x)]
+
+    def apply(self, xs: IntervalSet) -> IntervalSet:
+        """The image of every integer in xs."""
+        bounds, offsets = self.bounds, self.offsets
+        images = []
+        for start, end in xs.intervals():
+            i = bisect_right(bounds, start)
+            while i < len(bounds) and bounds[i] <= end:
+                images.append((start + offsets[i], bounds[i] - 1 + offsets[i]))
+                start = bounds[i]
+                i += 1
+            images.append((start + offsets[i], end + offsets[i]))
+        return IntervalSet(images)
+
+    def then(self, other: Self) -> Self:
+        """The map that applies self, then other."""
+        # Each of other's breakpoints splits whichever of our segments maps
+        # across it; the fused offset is constant between all of those points.
+        points = set(self.bounds)
+        for i, offset in enumerate(self.offsets):
+            lo = bisect_right(other.bounds, self.bounds[i - 1] + offset) if i else 0
+            hi = (
+                bisect_left(other.bounds, self.bounds[i] + offset) if i < len(self.bounds) else None
+            )
+            points.update(b - offset for b in other.bounds[lo:hi])
+        bounds = sorted(points)
+        # Sample each region at its first integer (or just below the first bound).
+        samples = [bounds[0] - 1, *bounds] if bounds else [0]
+        fused = self.__class__()
+        fused._set(bounds, [other(self(x)) - x for x in samples])
+        return fused
+
+    def __repr__(self) -> str:
+        name = self.__class__.__name__
+        return f"{name}(bounds={self.bounds.tolist()}, offsets={self.offsets.tolist()})"
+
+
 # <https://en.wikipedia.org/wiki/Summed-area_table>
 class SummedAreaTable:
+    """Sums over any rectangle of a grid of ints, in constant time per query.
+
+    The table is a flat list with a row and column of zero padding at the top
+    and left, so cell (x, y) holds the sum of everything above and left of it
+    inclusive at index `(y + 1) * (width + 1) + x + 1`.
+    """
+
+    width: int
+    height: int
+
     def __init__(self, width: int, height: int, valuefn: Callable[[Point], int]) -> None:
-        self.width = width
-        self.height = height
-        self.table: dict[Point, int] = defaultdict(int)
-        for x in range(width):
-            for y in range(height):
-                value = valuefn((x, y))
-                self.table[x, y] = (
-                    value + self.table[x, y - 1] + self.table[x - 1, y] - self.table[x - 1, y - 1]
-                )
+        self._build([[valuefn((x, y)) for x in range(width)] for y in range(height)])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> Self:
+        table = cls.__new__(cls)
+        table._build(rows)
+        return table
+
+    @classmethod
+    def from_grid[T](cls, grid: Grid[T], valuefn: Callable[[T], int] = int) -> Self:
+        """A table over valuefn of each of grid's cells."""
+        return cls.from_rows(
+            [[valuefn(grid[x, y]) for x in range(grid.width)] for y in range(grid.height)]
+        )
+
+    def _build(self, rows: Sequence[Sequence[int]]) -> None:
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        stride = self.width + 1
+        table = [0] * stride
+        for row in rows:
+            # Each row's running sums, plus the totals of the row above.
+            table.extend(map(add, accumulate(row, initial=0), table[-stride:], strict=True))
+        self.table = table
 
     def __getitem__(self, rect: Rect, /) -> int:
-        a, b = rect
-        min_x, max_x = sorted([a[0], b[0]])
-        min_y, max_y = sorted([a[1], b[1]])
+        """The sum over rect's cells; any part of rect outside the grid adds 0."""
+        (ax, ay), (bx, by) = rect
+        return self._sum(ax, ay, bx, by)
+
+    def query_many(self, rects: Iterable[Rect]) -> list[int]:
+        """The sum over each rect, in order."""
+        return [self._sum(ax, ay, bx, by) for (ax, ay), (bx, by) in rects]
+
+    def _sum(self, ax: int, ay: int, bx: int, by: int) -> int:
+        min_x, max_x = (ax, bx) if ax <= bx else (bx, ax)
+        min_y, max_y = (ay, by) if ay <= by else (by, ay)
+        # Clip to the grid, so corners outside it never index the wrong row.
+        min_x, max_x = max(min_x, 0), min(max_x, self.width - 1)
+        min_y, max_y = max(min_y, 0), min(max_y, self.height - 1)
+        if min_x > max_x or min_y > max_y:
+            return 0
+        table, stride = self.table, self.width + 1
+        top, bottom = min_y * stride, (max_y + 1) * stride
         return (
-            self.table[max_x, max_y]
-            + self.table[min_x - 1, min_y - 1]
-            - self.table[max_x, min_y - 1]
-            - self.table[min_x - 1, max_y]
+            table[bottom + max_x + 1]
+            - table[bottom + min_x]
+            - table[top + max_x + 1]
+            + table[top + min_x]
         )
@@ -1,10 +1,17 @@
 import math
-from collections.abc import Callable, Iterable, Iterator
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, MutableMapping, Sequence
 from functools import cache
-from typing import ClassVar
+from itertools import pairwise, product
+from typing import TYPE_CHECKING, ClassVar, Self, cast
 
 from aoc.util import IterableClass
 
+if TYPE_CHECKING:
+    from aoc.collections import SummedAreaTable
+
 Point = tuple[int, int]
 Vector = tuple[int, int]  # distinct from Point just for bookkeeping
 Rect = tuple[Point, Point]
@@ -56,11 +63,64 @@ class Dir8(metaclass=IterableClass[Vector]):
         return [(x + dx, y + dy) for dx, dy in cls]
 
 
+class PackedPoints:
+    """Points packed into single ints as `y * stride + x`, for hot loops.
+
+    Moving a packed point is one int addition, and packed points hash and
+    compare as plain ints. Any y round-trips, as does any x in
+    `[-stride // 2, stride // 2)`. Direction constants mirror Dir and Dir8, and
+    unpacking one gives back the matching Vector.
+    """
+
+    stride: int
+    dirs: tuple[int, int, int, int]
+    dirs8: tuple[int, int, int, int, int, int, int, int]
+    right: dict[int, int]
+    left: dict[int, int]
+
+    def __init__(self, stride: int = 1 << 20) -> None:
+        self.stride = stride
+        self.N, self.E, self.S, self.W = -stride, 1, stride, -1
+        self.NE, self.SE, self.SW, self.NW = 1 - stride, 1 + stride, stride - 1, -1 - stride
+        self.dirs = (self.N, self.E, self.S, self.W)
+        self.dirs8 = (self.N, self.NE, self.E, self.SE, self.S, self.SW, self.W, self.NW)
+        # Turn tables for the orthogonal directions: right[N] == E, etc.
+        self.right = {d: self.dirs[(i + 1) % 4] for i, d in enumerate(self.dirs)}
+        self.left = {d: self.dirs[(i - 1) % 4] for i, d in enumerate(self.dirs)}
+
+    def pack(self, p: Point) -> int:
+        x, y = p
+        return y * self.stride + x
+
+    def unpack(self, i: int) -> Point:
+        half = self.stride // 2
+        y, x = divmod(i + half, self.stride)
+        return x - half, y
+
+    def neighbors(self, i: int) -> list[int]:
+        return [i + d for d in self.dirs]
+
+    def neighbors8(self, i: int) -> list[int]:
+        return [i + d for d in self.dirs8]
+
+
 class Grid[T]:
+    """A rectangular grid of cells parsed from a multi-line string.
+
+    Cells live in a dict keyed by point, which copes with ragged input. Pass
+    `dense=True` for a `DenseGrid` instead, which stores cells in a flat list.
+    """
+
     height: int
     width: int
+    data: MutableMapping[Point, T]
 
-    def __init__(self, s: str, mapfn: Callable[[str], T] = str) -> None:
+    def __new__(cls, s: str, mapfn: Callable[[str], T] = str, *, dense: bool = False) -> Self:
+        if dense and cls is Grid:
+            return super().__new__(cast(type[Self], DenseGrid))
+        return super().__new__(cls)
+
+    def __init__(self, s: str, mapfn: Callable[[str], T] = str, *, dense: bool = False) -> None:
         lines = s.splitlines()
         self.data = {(x, y): mapfn(c) for y, line in enumerate(lines) for x, c in enumerate(line)}
         self.height = len(lines)
@@ -70,7 +130,7 @@ class Grid[T]:
         items = "".join(str(c) for c in sorted(set(self.data.values())))  # type: ignore
         return f'Grid(width={self.width}, height={self.height}, items="{items}")'
 
-    def __contains__(self, item: Point) -> bool:
+    def __contains__(self, item: object) -> bool:
         return item in self.data
 
     def __getitem__(self, item: Point) -> T:
@@ -92,12 +152,305 @@ class Grid[T]:
         for y in range(self.height):
             print("".join(str(self[x, y]) for x in range(self.width)))
 
+    def edges(self, passable: Callable[[T, T], bool], *, diagonal: bool = False) -> GridEdges[T]:
+        """Graph edges between neighboring cells where passable(from, to) holds."""
+        return GridEdges(self, passable, diagonal=diagonal)
+
+
+class DenseGrid[T](Grid[T]):
+    """A Grid backed by a flat, row-major list indexed by `y * width + x`.
+
+    Point lookups avoid tuple hashing, and hot loops can skip points entirely
+    by working with integer indexes via `index`, `point` and `neighbors`.
+    Input must be rectangular.
+    """
+
+    cells: list[T]
+
+    def __init__(self, s: str, mapfn: Callable[[str], T] = str, *, dense: bool = True) -> None:
+        lines = s.splitlines()
+        self.height = len(lines)
+        self.width = len(lines[0])
+        if any(len(line) != self.width for line in lines):
+            raise ValueError("dense grids must be rectangular")
+        self.cells = [mapfn(c) for line in lines for c in line]
+        self.data = DenseCells(self)
+
+    @classmethod
+    def from_cells(cls, width: int, height: int, cells: list[T]) -> DenseGrid[T]:
+        """A grid over an existing row-major list of cells, which is not copied."""
+        if len(cells) != width * height:
+            raise ValueError("cells do not fill the grid")
+        grid = object.__new__(cls)
+        grid.width, grid.height, grid.cells = width, height, cells
+        grid.data = DenseCells(grid)
+        return grid
+
+    def __repr__(self) -> str:
+        items = "".join(str(c) for c in sorted(set(self.cells)))  # type: ignore
+        return f'DenseGrid(width={self.width}, height={self.height}, items="{items}")'
+
+    def __contains__(self, item: object) -> bool:
+        match item:
+            case (int(x), int(y)):
+                return 0 <= x < self.width and 0 <= y < self.height
+        return False  # as Grid does for anything that isn't one of its points
+
+    def __getitem__(self, item: Point) -> T:
+        x, y = item
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError(item)
+        return self.cells[y * self.width + x]
+
+    def __setitem__(self, item: Point, value: T) -> None:
+        x, y = item
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError(item)
+        self.cells[y * self.width + x] = value
+
+    def find(self, value: T) -> Point:
+        try:
+            return self.point(self.cells.index(value))
+        except ValueError:
+            raise StopIteration from None  # as Grid.find does
+
+    def findall(self, value: T) -> list[Point]:
+        return [self.point(i) for i, v in enumerate(self.cells) if v == value]
+
+    def get(self, item: Point, default: T | None = None) -> T | None:
+        x, y = item
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x]
+        return default
+
+    def index(self, p: Point) -> int:
+        x, y = p
+        return y * self.width + x
+
+    def point(self, i: int) -> Point:
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def neighbors(self, i: int) -> list[int]:
+        """Indexes of the in-bounds orthogonal neighbors of index i."""
+        width = self.width
+        x = i % width
+        rv = []
+        if i >= width:
+            rv.append(i - width)
+        if x < width - 1:
+            rv.append(i + 1)
+        if i + width < len(self.cells):
+            rv.append(i + width)
+        if x > 0:
+            rv.append(i - 1)
+        return rv
+
+
+class DenseCells[T](MutableMapping[Point, T]):
+    """A live view of a DenseGrid's cells keyed by point, standing in for Grid.data.
+
+    Writes go through to the grid. Cells can't be deleted, since every point
+    in a dense grid has one.
+    """
+
+    def __init__(self, grid: DenseGrid[T]) -> None:
+        self.grid = grid
+
+    def __getitem__(self, p: Point) -> T:
+        return self.grid[p]
+
+    def __setitem__(self, p: Point, value: T) -> None:
+        self.grid[p] = value
+
+    def __delitem__(self, p: Point) -> None:
+        raise TypeError("cells can't be deleted from a dense grid")
+
+    def __iter__(self) -> Iterator[Point]:
+        point = self.grid.point
+        return (point(i) for i in range(len(self.grid.cells)))
+
+    def __len__(self) -> int:
+        return len(self.grid.cells)
+
+
+class GridEdges[T]:
+    """Precomputed adjacency between a grid's cells, usable as graph Edges.
+
+    The table is built on first use, as compressed sparse rows: the neighbors
+    of the cell at flat index i are `targets[offsets[i]:offsets[i + 1]]`. Hot
+    loops can use those indexes directly via `index` and `neighbors`; looking
+    up a point returns a tuple of its neighbors that is built only once. Later
+    changes to the grid are not reflected.
+    """
+
+    width: int
+    height: int
+    offsets: array[int]
+    targets: array[int]
+
+    def __init__(
+        self, grid: Grid[T], passable: Callable[[T, T], bool], *, diagonal: bool = False
+    ) -> None:
+        self.grid = grid
+        self.passable = passable
+        self.dirs: list[Vector] = list(Dir8 if diagonal else Dir)
+        self._adjacent: dict[Point, tuple[Point, ...]] | None = None
+
+    def _build(self) -> dict[Point, tuple[Point, ...]]:
+        grid = self.grid
+        missing = object()
+        values: list[T]
+        if isinstance(grid, DenseGrid):
+            self.width, self.height = grid.width, grid.height
+            values = grid.cells
+        else:
+            data = grid.data
+            # Ragged grids can have rows longer than the first.
+            self.width = max(x for x, _ in data) + 1
+            self.height = max(y for _, y in data) + 1
+            # Cells absent from a ragged grid are the missing sentinel, not a T.
+            values = cast(
+                list[T],
+                [data.get((x, y), missing) for y in range(self.height) for x in range(self.width)],
+            )
+        width, height, passable = self.width, self.height, self.passable
+        self._points = [(x, y) for y in range(height) for x in range(width)]
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        for i, (x, y) in enumerate(self._points):
+            value = values[i]
+            if value is not missing:
+                for dx, dy in self.dirs:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height:
+                        j = ny * width + nx
+                        if values[j] is not missing and passable(value, values[j]):
+                            self.targets.append(j)
+            self.offsets.append(len(self.targets))
+        points, offsets, targets = self._points, self.offsets, self.targets
+        self._adjacent = {
+            p: tuple(points[t] for t in targets[offsets[i] : offsets[i + 1]])
+            for i, p in enumerate(points)
+            if values[i] is not missing
+        }
+        return self._adjacent
+
+    def index(self, p: Point) -> int:
+        if self._adjacent is None:
+            self._build()
+        x, y = p
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError(p)
+        return y * self.width + x
+
+    def point(self, i: int) -> Point:
+        if self._adjacent is None:
+            self._build()
+        return self._points[i]
+
+    def neighbors(self, i: int) -> array[int]:
+        """Flat indexes of the cells reachable from flat index i."""
+        if self._adjacent is None:
+            self._build()
+        return self.targets[self.offsets[i] : self.offsets[i + 1]]
+
+    def __getitem__(self, p: Point) -> tuple[Point, ...]:
+        adjacent = self._build() if self._adjacent is None else self._adjacent
+        return adjacent[p]
+
+    def __iter__(self) -> Iterator[Point]:
+        return iter(self._build() if self._adjacent is None else self._adjacent)
+
+
+class CompressedPlane:
+    """A small dense grid standing in for a plane with a few far-apart points.
+
+    Every distinct x of the points gets a column of its own, and every gap
+    between consecutive xs gets one column covering all of it (likewise for
+    rows), so shapes drawn between the points keep their topology. Column i
+    covers original xs `x_bounds[i]` up to (not including) `x_bounds[i + 1]`.
+    """
+
+    x_bounds: list[int]
+    y_bounds: list[int]
+    width: int
+    height: int
+
+    def __init__(self, points: Iterable[Point]) -> None:
+        points = list(points)
+        self.x_bounds = self._bounds(x for x, _ in points)
+        self.y_bounds = self._bounds(y for _, y in points)
+        self.width = len(self.x_bounds) - 1
+        self.height = len(self.y_bounds) - 1
+
+    @staticmethod
+    def _bounds(coords: Iterable[int]) -> list[int]:
+        bounds: list[int] = []
+        for c in sorted(set(coords)):
+            if not bounds or bounds[-1] != c:
+                bounds.append(c)  # bounds[-1] was the start of a gap column
+            bounds.append(c + 1)
+        return bounds
+
+    def compress(self, p: Point) -> Point:
+        """The cell containing p, which may be outside the grid."""
+        x, y = p
+        return bisect_right(self.x_bounds, x) - 1, bisect_right(self.y_bounds, y) - 1
+
+    def expand(self, q: Point) -> Point:
+        """The first original point in cell q."""
+        i, j = q
+        return self.x_bounds[i], self.y_bounds[j]
+
+    def rect(self, q: Point) -> Rect:
+        """The original points in cell q, as inclusive corners."""
+        i, j = q
+        return (self.x_bounds[i], self.y_bounds[j]), (
+            self.x_bounds[i + 1] - 1,
+            self.y_bounds[j + 1] - 1,
+        )
+
+    def area(self, q: Point) -> int:
+        i, j = q
+        return (self.x_bounds[i + 1] - self.x_bounds[i]) * (self.y_bounds[j + 1] - self.y_bounds[j])
+
+    def grid[T](self, valuefn: Callable[[Point], T]) -> DenseGrid[T]:
+        """A grid with valuefn of each cell, for walking the compressed plane."""
+        return DenseGrid.from_cells(
+            self.width,
+            self.height,
+            [valuefn((i, j)) for j in range(self.height) for i in range(self.width)],
+        )
+
+    def summed_area(self, valuefn: Callable[[Point], int]) -> SummedAreaTable:
+        """Sums of valuefn over cells, each weighted by how many original points it covers.
+
+        Querying a rectangle of cells then gives the total over the original
+        points they cover.
+        """
+        from aoc.collections import SummedAreaTable  # which imports this module
+
+        widths = [b - a for a, b in pairwise(self.x_bounds)]
+        return SummedAreaTable.from_rows(
+            [
+                [valuefn((i, j)) * w * (b - a) for i, w in enumerate(widths)]
+                for j, (a, b) in enumerate(pairwise(self.y_bounds))
+            ]
+        )
+
 
 def mdist(a: Point, b: Point):
     (ax, ay), (bx, by) = a, b
     return abs(ax - bx) + abs(ay - by)
 
 
+def mdist_to(goal: Point) -> Callable[[Point], int]:
+    """Manhattan distance to goal, for use as an A* heuristic on grids."""
+    gx, gy = goal
+    return lambda p: abs(p[0] - gx) + abs(p[1] - gy)
+
+
 def opposite(d: Vector) -> Vector:
     x, y = d
     return (-x, -y)
@@ -147,6 +500,51 @@ def line_between(a: Point, b: Point) -> list[Point]:
     return [(xa + i * step_x, ya + i * step_y) for i in range(gcd + 1)]
 
 
+def closest_pairs(points: Sequence[Sequence[int]]) -> Iterator[tuple[int, int, int]]:
+    """Lazily yield (squared distance, i, j) for every pair i < j, nearest first.
+
+    Points are bucketed into a uniform grid whose cells are as wide as the
+    current search radius, so every pair within that radius sits in the same
+    or adjacent cells. Each round yields the pairs between the previous
+    radius and this one, then doubles it; consumers that stop early (e.g.
+    Kruskal's algorithm) never pay for the long tail of distant pairs.
+
+    Squared distances keep everything in exact ints and order like math.dist.
+    """
+    if len(points) < 2:
+        return
+    columns = list(zip(*points, strict=True))
+    spans = [max(c) - min(c) for c in columns]
+    dims = len(spans)
+    diameter2 = sum(span * span for span in spans)
+    # Start at roughly the typical spacing between points.
+    radius = max(1, int((math.prod(span + 1 for span in spans) / len(points)) ** (1 / dims)))
+    offsets = list(product((-1, 0, 1), repeat=dims))
+    done = -1
+    while done < diameter2:
+        r2 = radius * radius
+        buckets: dict[tuple[int, ...], list[int]] = defaultdict(list)
+        for i, p in enumerate(points):
+            buckets[tuple(c // radius for c in p)].append(i)
+        pairs = []
+        for cell, members in buckets.items():
+            for offset in offsets:
+                others = buckets.get(tuple(c + o for c, o in zip(cell, offset, strict=True)))
+                if others is None:
+                    continue
+                for i in members:
+                    p = points[i]
+                    for j in others:
+                        if i < j:
+                            d2 = sum((a - b) ** 2 for a, b in zip(p, points[j], strict=True))
+                            if done < d2 <= r2:
+                                pairs.append((d2, i, j))
+        pairs.sort()
+        yield from pairs
+        done = r2
+        radius *= 2
+
+
 def print_sparse_grid(points: dict[Point, str]) -> None:  # pragma: no cover
     (min_x, min_y), (max_x, max_y) = find_bounds(points)
     width = max_x - min_x + 1
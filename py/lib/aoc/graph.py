@@ -1,22 +1,21 @@
-import sys
-from collections import defaultdict, deque
-from collections.abc import Callable, Hashable, Iterator
+from collections import deque
+from collections.abc import Callable, Collection, Hashable, Iterable, Iterator
 from heapq import heappop, heappush
-from itertools import product
 from typing import Protocol, overload
 
 type WeightFn[T] = Callable[[T, T], int]
+type Heuristic[T] = Callable[[T], int]
 
 
 class Edges[T: Hashable](Protocol):
-    def __getitem__(self, key: T, /) -> set[T]:
-        """Set of edges for the given node."""
+    def __getitem__(self, key: T, /) -> Collection[T]:
+        """Neighbors of the given node (usually a set)."""
         ...
 
 
 class IterableEdges[T: Hashable](Protocol):
-    def __getitem__(self, key: T, /) -> set[T]:
-        """Set of edges for the given node."""
+    def __getitem__(self, key: T, /) -> Collection[T]:
+        """Neighbors of the given node (usually a set)."""
         ...
 
     def __iter__(self) -> Iterator[T]:
@@ -47,28 +46,76 @@ class Goal[T]:
         return self.check(other)  # type: ignore
 
 
+class Sources[T]:
+    """Used for searching from multiple nodes at once.
+
+    Nodes are often tuples, so a bare iterable would be ambiguous. Wrapping
+    the candidates seeds the search with all of them at distance 0, turning
+    "best start among N candidates" into a single search:
+
+    starts = Sources(grid.findall("a"))
+    shortest_path_length(G, starts, end)
+    """
+
+    def __init__(self, nodes: Iterable[T]):
+        self.nodes = list(nodes)
+
+
+def _sources[T](source: T | Sources[T]) -> list[T]:
+    return source.nodes if isinstance(source, Sources) else [source]
+
+
 @overload
 def shortest_path_length[T](
-    G: Edges[T], source: T, target: Comparable, weight: WeightFn[T] | None = None
+    G: Edges[T],
+    source: T | Sources[T],
+    target: Comparable,
+    weight: WeightFn[T] | None = None,
+    heuristic: Heuristic[T] | None = None,
+    *,
+    reverse: Edges[T] | None = None,
 ) -> int: ...
 
 
 @overload
 def shortest_path_length[T](
-    G: Edges[T], source: T, target: None = None, weight: WeightFn[T] | None = None
+    G: Edges[T],
+    source: T | Sources[T],
+    target: None = None,
+    weight: WeightFn[T] | None = None,
+    heuristic: Heuristic[T] | None = None,
 ) -> dict[T, int]: ...
 
 
 def shortest_path_length[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: Comparable | None = None,
     weight: WeightFn[T] | None = None,
+    heuristic: Heuristic[T] | None = None,
+    *,
+    reverse: Edges[T] | None = None,
 ) -> int | dict[T, int]:
-    if weight is None:
+    """Distance from source to target, or to every reachable node.
+
+    Uses BFS for unweighted graphs and Dijkstra otherwise. Passing a
+    heuristic switches to A*; it must never overestimate the remaining
+    distance to the target and must be consistent across edges, such as
+    `aoc.coords.mdist_to` on grids with unit-or-greater step costs.
+
+    Passing `reverse` (the graph's predecessor edges, or G itself if edges
+    are symmetric) runs a bidirectional BFS that meets in the middle; it
+    needs an unweighted graph and a concrete target node.
+    """
+    if reverse is not None:
+        meet, forward, backward, _previous, _following = _bidirectional_bfs(
+            G, reverse, source, target, weight, heuristic
+        )
+        return forward[meet] + backward[meet] if meet is not None else -1
+    if weight is None and heuristic is None:
         end, distance, _previous = _bfs(G, source, target)
     else:
-        end, distance, _previous = _dijkstra(G, source, target, weight)
+        end, distance, _previous = _dijkstra(G, source, target, weight or _unit, heuristic)
     if target is not None:
         return distance[end] if end is not None else -1
     else:
@@ -77,19 +124,41 @@ def shortest_path_length[T](
 
 def shortest_path[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: Comparable,
     weight: WeightFn[T] | None = None,
+    heuristic: Heuristic[T] | None = None,
+    *,
+    reverse: Edges[T] | None = None,
 ) -> list[T]:
-    if weight is None:
+    if reverse is not None:
+        meet, _forward, _backward, previous, following = _bidirectional_bfs(
+            G, reverse, source, target, weight, heuristic, with_path=True
+        )
+        if meet is None:
+            return []
+        path = [meet]
+        cur = meet
+        while cur in previous:
+            cur = previous[cur][0]
+            path.append(cur)
+        path.reverse()
+        cur = meet
+        while cur in following:
+            cur = following[cur][0]
+            path.append(cur)
+        return path
+    if weight is None and heuristic is None:
         end, _distance, previous = _bfs(G, source, target, with_path=True)
     else:
-        end, _distance, previous = _dijkstra(G, source, target, weight, with_path=True)
+        end, _distance, previous = _dijkstra(
+            G, source, target, weight or _unit, heuristic, with_path=True
+        )
     if end is None:
         return []
     path = [end]
     cur = end
-    while cur != source:
+    while cur in previous:
         cur = previous[cur][0]
         path.append(cur)
     return path[::-1]
@@ -97,14 +166,17 @@ def shortest_path[T](
 
 def all_shortest_paths[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: Comparable,
     weight: WeightFn[T] | None = None,
+    heuristic: Heuristic[T] | None = None,
 ) -> list[list[T]]:
-    if weight is None:
+    if weight is None and heuristic is None:
         end, _distance, previous = _bfs(G, source, target, with_all_paths=True)
     else:
-        end, _distance, previous = _dijkstra(G, source, target, weight, with_all_paths=True)
+        end, _distance, previous = _dijkstra(
+            G, source, target, weight or _unit, heuristic, with_all_paths=True
+        )
     paths = []
     if end is None:
         return paths
@@ -118,22 +190,61 @@ def all_shortest_paths[T](
     return paths
 
 
-# https://en.wikipedia.org/wiki/Floyd-Warshall_algorithm
-def all_shortest_path_lengths[T](G: IterableEdges[T]) -> dict[tuple[T, T], int]:
-    distance = defaultdict[tuple[T, T], int](lambda: sys.maxsize)
-    for src in G:
-        distance[src, src] = 0
-        for dst in G[src]:
-            distance[src, dst] = 1
-    for k, i, j in product(G, G, G):
-        distance[i, j] = min(distance[i, j], distance[i, k] + distance[k, j])
-    return {k: v for k, v in distance.items() if v < sys.maxsize}
+class DistanceMatrix[T]:
+    """Shortest path lengths between each pair of a chosen set of nodes.
+
+    `index` maps a node to its row (and column) in `rows`, so hot loops can
+    look up distances by integer instead of hashing node pairs. Unreachable
+    pairs are -1, as with shortest_path_length.
+    """
+
+    def __init__(self, nodes: Iterable[T], rows: list[list[int]]):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __getitem__(self, key: tuple[T, T], /) -> int:
+        a, b = key
+        return self.rows[self.index[a]][self.index[b]]
+
+
+def distance_matrix[T](
+    G: Edges[T], nodes: Iterable[T], weight: WeightFn[T] | None = None
+) -> DistanceMatrix[T]:
+    """Shortest path lengths between the given nodes, via one search from each.
+
+    Much cheaper than all_shortest_path_lengths when only a few nodes of a
+    large graph matter, e.g. compressing a maze down to its junctions.
+    """
+    nodes = list(dict.fromkeys(nodes))
+    rows = []
+    for src in nodes:
+        distance = shortest_path_length(G, src, weight=weight)
+        rows.append([distance.get(dst, -1) for dst in nodes])
+    return DistanceMatrix(nodes, rows)
+
+
+def all_shortest_path_lengths[T](
+    G: IterableEdges[T], weight: WeightFn[T] | None = None
+) -> dict[tuple[T, T], int]:
+    # One search per node is O(V * E), which beats Floyd-Warshall's O(V^3) on
+    # the sparse graphs puzzles tend to produce.
+    return {
+        (src, dst): d for src in G for dst, d in shortest_path_length(G, src, weight=weight).items()
+    }
+
+
+def _unit[T](a: T, b: T) -> int:
+    return 1
 
 
 @overload
 def _bfs[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: None,
     *,
     with_path=False,
@@ -144,7 +255,7 @@ def _bfs[T](
 @overload
 def _bfs[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: Comparable,
     *,
     with_path=False,
@@ -154,17 +265,18 @@ def _bfs[T](
 
 def _bfs[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: Comparable | None,
     *,
     with_path=False,
     with_all_paths=False,
 ) -> tuple[T | None, dict[T, int], dict[T, list[T]]]:
-    distance: dict[T, int] = {source: 0}
+    sources = _sources(source)
+    distance: dict[T, int] = dict.fromkeys(sources, 0)
     previous: dict[T, list[T]] = {}
 
     end = None
-    queue = deque([source])
+    queue = deque(distance)
     while queue:
         cur = queue.popleft()
         cur_dist = distance[cur]
@@ -188,12 +300,64 @@ def _bfs[T](
     return end, distance, previous
 
 
+def _bidirectional_bfs[T](
+    G: Edges[T],
+    R: Edges[T],
+    source: T | Sources[T],
+    target: Comparable | None,
+    weight: WeightFn[T] | None,
+    heuristic: Heuristic[T] | None,
+    *,
+    with_path=False,
+) -> tuple[T | None, dict[T, int], dict[T, int], dict[T, list[T]], dict[T, list[T]]]:
+    if target is None or isinstance(target, Goal):
+        raise ValueError("bidirectional search needs a target node")
+    if weight is not None or heuristic is not None:
+        raise ValueError("bidirectional search only supports unweighted graphs")
+    target_node: T = target  # type: ignore
+    forward: dict[T, int] = dict.fromkeys(_sources(source), 0)
+    backward: dict[T, int] = {target_node: 0}
+    previous: dict[T, list[T]] = {}
+    following: dict[T, list[T]] = {}
+    if target_node in forward:
+        return target_node, forward, backward, previous, following
+
+    # Expand whole levels from whichever side has the smaller frontier. Once a
+    # level produces a node seen from the other side, the best meeting point
+    # within that level is a shortest path.
+    forward_queue, backward_queue = deque(forward), deque(backward)
+    meet = None
+    best = 0
+    while forward_queue and backward_queue:
+        if len(forward_queue) <= len(backward_queue):
+            queue, edges, distance, other, links = forward_queue, G, forward, backward, previous
+        else:
+            queue, edges, distance, other, links = backward_queue, R, backward, forward, following
+        for _ in range(len(queue)):
+            cur = queue.popleft()
+            d = distance[cur] + 1
+            for neighbor in edges[cur]:
+                if neighbor in distance:
+                    continue
+                distance[neighbor] = d
+                queue.append(neighbor)
+                if with_path:
+                    links[neighbor] = [cur]
+                if neighbor in other and (meet is None or d + other[neighbor] < best):
+                    meet, best = neighbor, d + other[neighbor]
+        if meet is not None:
+            break
+
+    return meet, forward, backward, previous, following
+
+
 @overload
 def _dijkstra[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: None,
     weight: WeightFn[T],
+    heuristic: Heuristic[T] | None = None,
     *,
     with_path=False,
     with_all_paths=False,
@@ -203,9 +367,10 @@ def _dijkstra[T](
 @overload
 def _dijkstra[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: Comparable,
     weight: WeightFn[T],
+    heuristic: Heuristic[T] | None = None,
     *,
     with_path=False,
     with_all_paths=False,
@@ -214,29 +379,37 @@ def _dijkstra[T](
 
 def _dijkstra[T](
     G: Edges[T],
-    source: T,
+    source: T | Sources[T],
     target: Comparable | None,
     weight: WeightFn[T],
+    heuristic: Heuristic[T] | None = None,
     *,
     with_path=False,
     with_all_paths=False,
 ) -> tuple[T | None, dict[T, int], dict[T, list[T]]]:
+    sources = _sources(source)
     distance: dict[T, int] = {}
-    seen: dict[T, int] = {}
+    seen: dict[T, int] = dict.fromkeys(sources, 0)
     previous: dict[T, list[T]] = {}
 
+    # Heap entries are keyed by priority, which is the distance so far plus
+    # the heuristic estimate for A* (or just the distance for Dijkstra). Ties
+    # go to the node farthest along, so A* dives toward the target rather than
+    # fanning out across equally promising nodes.
     end = None
-    heap = [(0, source)]
+    end_priority = 0
+    heap = [(heuristic(s) if heuristic else 0, 0, s) for s in seen]
     while heap:
-        d, cur = heappop(heap)
+        priority, _, cur = heappop(heap)
 
         if cur in distance:
             continue
-        distance[cur] = d
-        if with_all_paths and end is not None and d > distance[end]:
+        d = distance[cur] = seen[cur]
+        if with_all_paths and end is not None and priority > end_priority:
             break
         if cur == target:
             end = cur
+            end_priority = priority
             if not with_all_paths:
                 break
 
@@ -247,7 +420,7 @@ def _dijkstra[T](
                     previous[neighbor].append(cur)
             elif neighbor not in seen or nd < seen[neighbor]:
                 seen[neighbor] = nd
-                heappush(heap, (nd, neighbor))
+                heappush(heap, (nd + heuristic(neighbor) if heuristic else nd, -nd, neighbor))
                 if with_path or with_all_paths:
                     previous[neighbor] = [cur]
             elif with_all_paths and nd == seen[neighbor]:
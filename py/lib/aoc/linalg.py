@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
 from fractions import Fraction
 
 type Matrix[T: int | Fraction] = list[list[T]]
@@ -63,3 +65,77 @@ def to_reduced_row_echelon_form(matrix: Matrix) -> Matrix[Fraction]:
             break
 
     return matrix
+
+
+@dataclass
+class Echelon:
+    """An augmented integer matrix in reduced row echelon form, scaled to stay integral.
+
+    Every pivot equals `denominator` rather than 1, so dividing the whole
+    matrix by it gives the usual reduced form. Row i (for i < rank) has its
+    pivot in column `pivots[i]`; `free` lists the coefficient columns without
+    one, whose variables can take any value.
+    """
+
+    matrix: Matrix[int]
+    denominator: int
+    pivots: list[int]
+    free: list[int]
+
+    @property
+    def rank(self) -> int:
+        return len(self.pivots)
+
+    @property
+    def consistent(self) -> bool:
+        """Whether the system has any solution at all."""
+        return all(row[-1] == 0 for row in self.matrix[self.rank :])
+
+    def to_fractions(self) -> Matrix[Fraction]:
+        return [[Fraction(x, self.denominator) for x in row] for row in self.matrix]
+
+
+# <https://en.wikipedia.org/wiki/Bareiss_algorithm>
+def fraction_free_rref(matrix: Matrix[int]) -> Echelon:
+    """Reduce an augmented integer matrix using only exact integer arithmetic.
+
+    This is Gauss-Jordan elimination with Bareiss's trick: each step
+    cross-multiplies by the new pivot and divides by the previous one, which
+    always divides exactly and keeps entries from growing out of hand.
+    """
+    rows = [list(row) for row in matrix]
+    m = len(rows)
+    n = len(rows[0])
+    pivots = []
+    previous = 1
+    for col in range(n - 1):
+        r = len(pivots)
+        if r == m:
+            break
+        swap = next((y for y in range(r, m) if rows[y][col]), None)
+        if swap is None:
+            continue
+        rows[r], rows[swap] = rows[swap], rows[r]
+        pivot_row = rows[r]
+        pivot = pivot_row[col]
+        for y in range(m):
+            if y != r:
+                row = rows[y]
+                factor = row[col]
+                rows[y] = [
+                    (pivot * a - factor * b) // previous
+                    for a, b in zip(row, pivot_row, strict=True)
+                ]
+        previous = pivot
+        pivots.append(col)
+
+    if previous < 0:
+        rows = [[-x for x in row] for row in rows]
+        previous = -previous
+    pivot_cols = set(pivots)
+    free = [col for col in range(n - 1) if col not in pivot_cols]
+    return Echelon(rows, previous, pivots, free)
+
+
+def fraction_free_rref_many(matrices: Iterable[Matrix[int]]) -> list[Echelon]:
+    return [fraction_free_rref(matrix) for matrix in matrices]
@@ -1,6 +1,9 @@
 import functools
 import re
-from typing import Callable, TypeVar, overload
+import string
+from array import array
+from collections.abc import Iterator
+from typing import Any, Callable, TypeVar, overload
 
 unsigned_num_re = re.compile(r"\d+")
 num_re = re.compile(r"[-+]?\d+")
@@ -15,10 +18,46 @@ def line_parser[T](fn: Callable[[str], T]) -> Callable[[str], list[T]]:
     return wrapper
 
 
+def _lines(s: str, start: int, stop: int) -> Iterator[str]:
+    while start < stop:
+        end = s.find("\n", start, stop)
+        if end == -1:
+            end = stop
+        yield s[start:end]
+        start = end + 1
+
+
+def iter_lines(s: str) -> Iterator[str]:
+    """Lazily yield the lines of s, as `s.splitlines()` would."""
+    return _lines(s, 0, len(s))
+
+
 def all_numbers(s: str, unsigned=False) -> list[int]:
     return [int(x) for x in (unsigned_num_re if unsigned else num_re).findall(s)]
 
 
+def number_array(s: str, unsigned=False) -> array[int]:
+    """All the numbers in s, parsed in one pass into a flat array of int64s."""
+    return array("q", map(int, (unsigned_num_re if unsigned else num_re).findall(s)))
+
+
+def number_columns(s: str, n: int, unsigned=False) -> list[array[int]]:
+    """All the numbers in s, dealt round-robin into n columns.
+
+    Suits inputs with a fixed count of numbers per line, where column i holds
+    the ith number from every line.
+    """
+    numbers = number_array(s, unsigned)
+    if len(numbers) % n:
+        raise ValueError(f"{len(numbers)} numbers don't divide into {n} columns")
+    return [numbers[i::n] for i in range(n)]
+
+
+def iter_numbers(s: str, unsigned=False) -> Iterator[int]:
+    """Lazily yield the numbers in s, as `all_numbers` would."""
+    return (int(m[0]) for m in (unsigned_num_re if unsigned else num_re).finditer(s))
+
+
 def first_number(s: str, unsigned=False) -> int:
     match = (unsigned_num_re if unsigned else num_re).search(s)
     if not match:
@@ -45,3 +84,115 @@ def paras(s: str, mapper: Callable[[str], T] | None = None) -> list[list[T]] | l
     if mapper:
         rv = [[mapper(line) for line in lines] for lines in rv]
     return rv
+
+
+@overload
+def iter_paras[T](s: str, mapper: Callable[[str], T]) -> Iterator[list[T]]: ...
+
+
+@overload
+def iter_paras(s: str) -> Iterator[list[str]]: ...
+
+
+def iter_paras[T](s: str, mapper: Callable[[str], T] | None = None) -> Iterator[list[Any]]:
+    """Lazily yield the paragraphs of s, as `paras` would.
+
+    Only one paragraph's lines are held at a time.
+    """
+    start, n = 0, len(s)
+    while True:
+        end = s.find("\n\n", start)
+        stop = n if end == -1 else end
+        lines = _lines(s, start, stop)
+        yield [mapper(line) for line in lines] if mapper else list(lines)
+        if end == -1:
+            return
+        start = end + 2
+        while start < n and s[start] == "\n":
+            start += 1
+
+
+_field_types: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "": (r".*?", str),
+    "int": (r"[-+]?\d+", int),
+    "word": (r"\w+", str),
+    "ints": (r".*?", all_numbers),
+    "words": (r".*?", re.compile(r"\w+").findall),
+}
+
+
+class RecordFormat:
+    """A line template, compiled once into a single anchored regex.
+
+    Templates use format-string syntax: `{name}` captures any text, and
+    `{name:int}`, `{name:word}`, `{name:ints}` or `{name:words}` capture and
+    convert a typed field. `{}` skips text without capturing it, and `{{`/`}}`
+    are literal braces. For example:
+
+        Valve {name:word} has flow rate={rate:int}; {} valve{} {tunnels:words}
+    """
+
+    fields: tuple[str, ...]
+    pattern: re.Pattern[str]
+
+    def __init__(self, template: str):
+        fields = []
+        converters = []
+        parts = []
+        for literal, name, spec, _ in string.Formatter().parse(template):
+            parts.append(re.escape(literal))
+            if name is None:
+                continue
+            if spec not in _field_types:
+                raise ValueError(f"unknown field type: {spec!r}")
+            pattern, convert = _field_types[spec]
+            if name:
+                fields.append(name)
+                converters.append(convert)
+                parts.append(f"({pattern})")
+            else:
+                parts.append(f"(?:{pattern})")
+        self.fields = tuple(fields)
+        self.pattern = re.compile(f"^{''.join(parts)}$", re.MULTILINE)
+        self._converters = converters if any(c is not str for c in converters) else None
+
+    def _values(self, match: re.Match[str]) -> tuple:
+        if self._converters is None:
+            return match.groups()
+        return tuple(c(v) for c, v in zip(self._converters, match.groups(), strict=True))
+
+    def match(self, line: str) -> tuple:
+        match = self.pattern.fullmatch(line)
+        if not match:
+            raise ValueError(f"line doesn't match template: {line!r}")
+        return self._values(match)
+
+    def parse[R](self, s: str, into: Callable[..., R] | None = None) -> list[R] | list[tuple]:
+        """Match every line of s in one pass, returning a record for each.
+
+        Records are tuples of field values, or `into(*values)` if given (such
+        as a NamedTuple or a `dataclass(slots=True)`).
+        """
+        records = []
+        pos = 0
+        for match in self.pattern.finditer(s):
+            # Stop at a line that didn't match (or at an empty match past the end).
+            if match.start() != pos or pos == len(s):
+                break
+            values = self._values(match)
+            records.append(into(*values) if into else values)
+            pos = match.end() + 1
+        if pos < len(s):
+            end = s.find("\n", pos)
+            self.match(s[pos : end if end != -1 else len(s)])  # raises
+        return records
+
+
+@functools.cache
+def record_format(template: str) -> RecordFormat:
+    return RecordFormat(template)
+
+
+def records(template: str, s: str, into: Callable[..., Any] | None = None) -> list:
+    """Parse each line of s with a (cached) RecordFormat for template."""
+    return record_format(template).parse(s, into)
@@ -39,6 +39,14 @@ def ndigits(n: int) -> int:
     return math.floor(math.log10(n)) + 1
 
 
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
 def mod_range(x: int, lower: int, upper: int) -> int:
     """x % mod, but to be within [lower, upper). Handles negatives."""
     n = upper - lower
@@ -0,0 +1,103 @@
+"""
+A long-lived solver process, so a runner can skip interpreter startup and
+library imports for every day it runs. Invoke as `python -m aoc.worker <url>`.
+
+The worker connects to the websocket once and waits for Run messages. For each
+one it acknowledges with Ready (or Stale, see below), then executes the day
+file as `__main__`; its call to aoc.main speaks the usual protocol over the
+worker's connection. When the day is finished the worker sends Exit and waits
+for the next Run. A Done message shuts the worker down.
+
+Day files are re-executed on every run, so edits to them are always picked up.
+Library modules stay imported; if any of them has changed on disk since the
+worker started, it answers Stale and exits so the runner can start a fresh one.
+
+    Run { "run": <string: path to the day file> }
+    Ready { "ready": true }
+    Stale { "stale": true }
+    Exit { "exit": <int: the status the day would have exited with> }
+"""
+
+import json
+import runpy
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from websockets.sync.client import connect
+
+import aoc
+
+
+class _Session:
+    """One day's view of the worker connection; notes when its inputs run out."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.finished = False
+
+    def send(self, message: str) -> None:
+        self.websocket.send(message)
+
+    def recv(self) -> str:
+        message = self.websocket.recv()
+        if json.loads(message).get("done"):
+            self.finished = True
+        return message
+
+
+def _is_stale(since: float) -> bool:
+    lib = Path(aoc.__file__).parent
+    for mod in list(sys.modules.values()):
+        f = getattr(mod, "__file__", None)
+        if f is None or not Path(f).is_relative_to(lib):
+            continue
+        try:
+            if Path(f).stat().st_mtime > since:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def run_day(websocket, path: str) -> int:
+    session = _Session(websocket)
+    aoc._worker = session
+    sys.argv = [path]
+    code = 0
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        aoc._worker = None
+    # The day never got as far as aoc.main (or bailed out of it); answer any
+    # remaining inputs so the runner isn't left waiting.
+    while not session.finished:
+        if not json.loads(session.recv()).get("done"):
+            websocket.send(json.dumps({"done": True}))
+    return code
+
+
+def main(url: str) -> None:
+    started = time.time()
+    with connect(url) as websocket:
+        while True:
+            msg = json.loads(websocket.recv())
+            if msg.get("done"):
+                break
+            if _is_stale(started):
+                websocket.send(json.dumps({"stale": True}))
+                break
+            websocket.send(json.dumps({"ready": True}))
+            code = run_day(websocket, msg["run"])
+            sys.stdout.flush()
+            websocket.send(json.dumps({"exit": code}))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from aoc.bitgrid import BitGrid
+from aoc.coords import Dir, Dir8
+
+
+class TestBitGrid:
+    def test_mask_and_points_round_trip(self):
+        B = BitGrid(5, 4)
+        points = [(0, 0), (4, 0), (2, 1), (0, 3), (4, 3)]
+        mask = B.mask(points)
+        assert sorted(B.points(mask), key=lambda p: (p[1], p[0])) == sorted(
+            points, key=lambda p: (p[1], p[0])
+        )
+        assert mask.bit_count() == len(points)
+        assert mask == sum(B.bit(p) for p in points)
+
+    def test_mask_outside_grid(self):
+        with pytest.raises(ValueError):
+            BitGrid(3, 3).mask([(3, 0)])
+
+    def test_cells_and_border(self):
+        B = BitGrid(4, 3)
+        assert set(B.points(B.cells)) == {(x, y) for x in range(4) for y in range(3)}
+        assert set(B.points(B.border)) == {(x, y) for x in range(4) for y in range(3)} - {
+            (1, 1),
+            (2, 1),
+        }
+        assert set(B.points(B.columns(1, 3))) == {(x, y) for x in (1, 2) for y in range(3)}
+        assert set(B.points(B.rows(2, 3))) == {(x, 2) for x in range(4)}
+
+    @pytest.mark.parametrize("d", [*Dir8, (2, 0), (-3, 1), (0, -2)])
+    def test_shift_drops_cells_off_the_edge(self, d):
+        B = BitGrid(5, 4)
+        every = [(x, y) for x in range(5) for y in range(4)]
+        (dx, dy) = d
+        expected = {(x + dx, y + dy) for x, y in every if 0 <= x + dx < 5 and 0 <= y + dy < 4}
+        assert set(B.points(B.shift(B.cells, dx, dy))) == expected
+
+    @pytest.mark.parametrize("d", [(5, 0), (-6, 0), (0, 4), (0, -9), (1, 4), (-20, -1)])
+    def test_shift_off_the_grid_entirely(self, d):
+        B = BitGrid(5, 4)
+        assert B.shift(B.cells, *d) == 0
+
+    def test_single_column_shift_does_not_wrap_rows(self):
+        B = BitGrid(5, 4)
+        right_edge = B.columns(4, 5)
+        left_edge = B.columns(0, 1)
+        assert B.shift(right_edge, 1) == 0
+        assert B.shift(left_edge, -1) == 0
+        assert set(B.points(B.shift(right_edge, -1))) == {(3, y) for y in range(4)}
+        assert set(B.points(B.shift(left_edge, 1))) == {(1, y) for y in range(4)}
+
+    @pytest.mark.parametrize("d", [(1, 0), (-1, 0), (0, 1), (0, -1), (7, -9), (-4, 3)])
+    def test_roll_wraps(self, d):
+        B = BitGrid(5, 4)
+        points = [(0, 0), (4, 0), (2, 1), (4, 3)]
+        dx, dy = d
+        expected = {((x + dx) % 5, (y + dy) % 4) for x, y in points}
+        assert set(B.points(B.roll(B.mask(points), dx, dy))) == expected
+
+    def test_spread(self):
+        B = BitGrid(5, 5)
+        mask = B.mask([(0, 0), (3, 3)])
+        assert set(B.points(B.spread(mask))) == {
+            (0, 0),
+            (1, 0),
+            (0, 1),
+            (3, 3),
+            *Dir.neighbors((3, 3)),
+        }
+        assert set(B.points(B.spread(mask, diagonal=True))) == {
+            (0, 0),
+            (1, 0),
+            (0, 1),
+            (1, 1),
+            (3, 3),
+            *Dir8.neighbors((3, 3)),
+        }
+
+    @pytest.mark.parametrize("n", range(1, 9))
+    def test_count_at_least_matches_per_cell_count(self, n):
+        rng = random.Random(n)
+        B = BitGrid(9, 7)
+        live = {(x, y) for x in range(9) for y in range(7) if rng.random() < 0.5}
+        expected = {
+            (x, y)
+            for x in range(9)
+            for y in range(7)
+            if sum(q in live for q in Dir8.neighbors((x, y))) >= n
+        }
+        assert set(B.points(B.count_at_least(B.mask(live), n, diagonal=True))) == expected
@@ -1,6 +1,19 @@
+import random
+
 import pytest
 
-from aoc.collections import Bitmask, DisjointSet, Range, SummedAreaTable
+from aoc.collections import (
+    Bitmask,
+    DisjointSet,
+    IntDisjointSet,
+    IntervalSet,
+    OffsetMap,
+    Range,
+    SummedAreaTable,
+    first_disconnecting,
+)
+from aoc.coords import Dir, Grid
+from aoc.graph import shortest_path_length
 
 
 class TestBitmask:
@@ -191,6 +204,129 @@ class TestDisjointSet:
         assert ds.root(3) == root
         assert ds.root(4) == root
 
+    def test_union_reports_merge(self):
+        ds = DisjointSet("abc")
+        assert ds.union("a", "b")
+        assert not ds.union("b", "a")
+
+    def test_union_many(self):
+        ds = DisjointSet([1, 2, 3, 4, 5])
+        ds.union_many([(1, 2), (3, 4), (2, 4)])
+        assert len(ds) == 2
+        assert sorted(ds.sizes()) == [1, 4]
+
+    def test_duplicate_items(self):
+        ds = DisjointSet([1, 2, 2])
+        assert len(ds) == 2
+
+    def test_tuple_items(self):
+        ds = DisjointSet([(0, 0), (0, 1), (5, 5)])
+        ds.union((0, 0), (0, 1))
+        assert ds.root((0, 1)) == ds.root((0, 0))
+        assert {(5, 5)} in ds.components()
+
+
+class TestIntDisjointSet:
+    def test_initial_state(self):
+        ds = IntDisjointSet(3)
+        assert len(ds) == 3
+        assert [ds.root(x) for x in range(3)] == [0, 1, 2]
+        assert ds.sizes() == [1, 1, 1]
+
+    def test_union(self):
+        ds = IntDisjointSet(4)
+        assert ds.union(0, 1)
+        assert not ds.union(1, 0)
+        assert len(ds) == 3
+        assert ds.root(0) == ds.root(1)
+
+    def test_merge_into_largest(self):
+        ds = IntDisjointSet(4)
+        ds.union(0, 1)
+        ds.union(0, 2)
+        ds.union(3, 0)
+        assert ds.root(3) == 0
+
+    def test_union_many(self):
+        ds = IntDisjointSet(6)
+        ds.union_many([(0, 1), (2, 3), (1, 3), (4, 4)])
+        assert len(ds) == 3
+        assert sorted(ds.sizes()) == [1, 1, 4]
+
+    def test_components(self):
+        ds = IntDisjointSet(5)
+        ds.union_many([(0, 4), (1, 2)])
+        assert sorted(sorted(c) for c in ds.components()) == [[0, 4], [1, 2], [3]]
+
+    def test_long_chain(self):
+        n = 100_000
+        ds = IntDisjointSet(n)
+        ds.union_many((i, i + 1) for i in range(n - 1))
+        assert len(ds) == 1
+        assert ds.sizes() == [n]
+        assert ds.root(n - 1) == ds.root(0)
+
+    def test_empty(self):
+        ds = IntDisjointSet(0)
+        assert len(ds) == 0
+        assert ds.components() == []
+        assert ds.sizes() == []
+
+
+class TestFirstDisconnecting:
+    def line(self, n: int):
+        # 0 - 1 - 2 - ... - n-1
+        return range(n), lambda i: [i - 1, i + 1]
+
+    def test_line(self):
+        nodes, neighbors = self.line(5)
+        assert first_disconnecting(nodes, [4, 2, 1], neighbors, 0, 3) == 1
+
+    def test_never_disconnected(self):
+        nodes, neighbors = self.line(5)
+        assert first_disconnecting(nodes, [4], neighbors, 0, 3) is None
+
+    def test_blocking_start(self):
+        nodes, neighbors = self.line(5)
+        assert first_disconnecting(nodes, [4, 0], neighbors, 0, 3) == 1
+
+    def test_duplicate_blockers(self):
+        nodes, neighbors = self.line(5)
+        assert first_disconnecting(nodes, [2, 2, 1], neighbors, 0, 3) == 0
+        assert first_disconnecting(nodes, [4, 4, 1], neighbors, 0, 3) == 2
+
+    def test_unknown_blockers_ignored(self):
+        nodes, neighbors = self.line(5)
+        assert first_disconnecting(nodes, [9, 1], neighbors, 0, 3) == 1
+
+    def test_never_connected(self):
+        assert first_disconnecting([0, 1], [], lambda i: [], 0, 1) is None
+
+    def test_grid(self):
+        # Walling off column 1 takes three blockers; the last one cuts it.
+        cells = [(x, y) for y in range(3) for x in range(3)]
+        blockers = [(1, 0), (2, 2), (1, 2), (1, 1), (0, 0)]
+        assert first_disconnecting(cells, blockers, Dir.neighbors, (0, 2), (2, 0)) == 3
+
+    def test_matches_brute_force(self):
+        size = 6
+        cells = [(x, y) for y in range(size) for x in range(size)]
+        blockers = [(3, y) for y in (0, 5, 2, 4)] + [(0, 4), (3, 1), (2, 2), (3, 3)]
+
+        class Open:
+            def __init__(self, blocked):
+                self.blocked = set(blocked)
+
+            def __getitem__(self, p):
+                return {n for n in Dir.neighbors(p) if n in cells and n not in self.blocked}
+
+        expected = next(
+            i
+            for i in range(len(blockers))
+            if shortest_path_length(Open(blockers[: i + 1]), (0, 0), (5, 5)) == -1
+        )
+        assert first_disconnecting(cells, blockers, Dir.neighbors, (0, 0), (5, 5)) == expected
+
 
 class TestRange:
     def test_from_str(self):
@@ -323,6 +459,86 @@ class TestRange:
         assert Range(30, 40) in result
 
 
+class TestIntervalSet:
+    def test_merges_overlapping_and_adjacent(self):
+        s = IntervalSet([(10, 20), (30, 40), (15, 25), (26, 28), (50, 50)])
+        assert s.intervals() == [(10, 28), (30, 40), (50, 50)]
+
+    def test_skips_empty_intervals(self):
+        assert IntervalSet([(5, 4)]).intervals() == []
+        assert not IntervalSet()
+
+    def test_contains(self):
+        s = IntervalSet([(10, 20), (30, 40)])
+        assert [x for x in range(8, 43) if x in s] == [*range(10, 21), *range(30, 41)]
+
+    def test_len(self):
+        assert len(IntervalSet([(10, 20), (30, 40), (-5, -5)])) == 23
+
+    def test_count_contained(self):
+        s = IntervalSet([(3, 5), (10, 14), (16, 20)])
+        assert s.count_contained([1, 5, 8, 11, 17, 32, 5]) == 4
+
+    def test_shift(self):
+        assert IntervalSet([(1, 3), (7, 8)]).shift(-4) == IntervalSet([(-3, -1), (3, 4)])
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_set_operations_match_python_sets(self, seed):
+        rng = random.Random(seed)
+
+        def random_intervals():
+            return [
+                (a, a + rng.randint(-1, 8)) for a in rng.choices(range(50), k=rng.randint(0, 6))
+            ]
+
+        def points(s):
+            return {x for start, end in s.intervals() for x in range(start, end + 1)}
+
+        a, b = IntervalSet(random_intervals()), IntervalSet(random_intervals())
+        assert points(a | b) == points(a) | points(b)
+        assert points(a & b) == points(a) & points(b)
+        assert points(a - b) == points(a) - points(b)
+        assert a | b == IntervalSet(sorted((x, x) for x in points(a) | points(b)))
+
+
+class TestOffsetMap:
+    def test_call(self):
+        m = OffsetMap([(98, 99, -48), (50, 97, 2)])
+        assert [m(x) for x in (0, 49, 50, 97, 98, 99, 100)] == [0, 49, 52, 99, 50, 51, 100]
+
+    def test_merges_equal_neighbors(self):
+        m = OffsetMap([(0, 4, 3), (5, 9, 3), (20, 29, 0)])
+        assert m.bounds.tolist() == [0, 10]
+        assert m.offsets.tolist() == [0, 3, 0]
+
+    def test_overlap_raises(self):
+        with pytest.raises(ValueError):
+            OffsetMap([(0, 10, 1), (5, 15, 2)])
+
+    def test_apply(self):
+        m = OffsetMap([(98, 99, -48), (50, 97, 2)])
+        assert m.apply(IntervalSet([(79, 92), (55, 67)])) == IntervalSet([(57, 69), (81, 94)])
+        assert m.apply(IntervalSet([(45, 100)])) == IntervalSet([(45, 49), (50, 51), (52, 100)])
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_then_matches_applying_in_turn(self, seed):
+        rng = random.Random(seed)
+
+        def random_map():
+            starts = sorted(rng.sample(range(-30, 30), 6))
+            return OffsetMap(
+                (a, b - 1, rng.randint(-10, 10))
+                for a, b in zip(starts[::2], starts[1::2], strict=True)
+            )
+
+        first, second, third = random_map(), random_map(), random_map()
+        fused = first.then(second).then(third)
+        for x in range(-60, 60):
+            assert fused(x) == third(second(first(x)))
+        xs = IntervalSet([(-50, -20), (0, 3), (10, 40)])
+        assert fused.apply(xs) == third.apply(second.apply(first.apply(xs)))
+
+
 class TestSummedAreaTable:
     def unique_table(self) -> SummedAreaTable:
         # 1 2 3
@@ -362,3 +578,27 @@ class TestSummedAreaTable:
         table = self.unique_table()
         assert table[(0, 0), (2, 0)] == 6
         assert table[(2, 0), (0, 0)] == 6
+
+    def test_from_rows_matches_valuefn(self):
+        table = SummedAreaTable.from_rows([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        assert table.table == self.unique_table().table
+        assert table[(1, 1), (2, 2)] == 28
+
+    def test_from_grid(self):
+        table = SummedAreaTable.from_grid(Grid("#.#\n##.", lambda c: c == "#"))
+        assert (table.width, table.height) == (3, 2)
+        assert table[(0, 0), (2, 1)] == 4
+        assert table[(1, 0), (2, 1)] == 2
+
+    def test_query_many(self):
+        table = self.unique_table()
+        rects = [((0, 0), (2, 2)), ((1, 1), (1, 1)), ((2, 0), (0, 0)), ((2, 2), (1, 1))]
+        assert table.query_many(rects) == [table[r] for r in rects] == [45, 5, 6, 28]
+
+    def test_rects_are_clipped_to_the_grid(self):
+        table = self.unique_table()
+        assert table[(-1, -1), (0, 0)] == 1
+        assert table[(1, -5), (9, 0)] == 5  # 2 + 3
+        assert table[(-3, 2), (-1, 2)] == 0
+        assert table[(3, 0), (5, 5)] == 0
+        assert table.query_many([((-1, 1), (1, 9)), ((0, 3), (2, 3))]) == [24, 0]
@@ -1,19 +1,29 @@
+import random
+from itertools import combinations
+
 import pytest
 
 from aoc.coords import (
+    CompressedPlane,
+    DenseGrid,
     Dir,
     Dir8,
     Grid,
+    GridEdges,
+    PackedPoints,
     addp,
     area,
+    closest_pairs,
     find_bounds,
     line_between,
     mdist,
+    mdist_to,
     opposite,
     subp,
     turn_left,
     turn_right,
 )
+from aoc.graph import all_shortest_path_lengths, shortest_path_length
 
 
 class TestDir:
@@ -69,6 +79,36 @@ class TestDir8:
         }
 
 
+class TestPackedPoints:
+    @pytest.mark.parametrize("p", [(0, 0), (5, 7), (-3, 2), (4, -9), (-511, -1000), (511, 3)])
+    def test_round_trip(self, p):
+        P = PackedPoints(1024)
+        assert P.unpack(P.pack(p)) == p
+
+    def test_dirs_match_vectors(self):
+        P = PackedPoints()
+        assert [P.unpack(d) for d in P.dirs] == list(Dir)
+        assert [P.unpack(d) for d in P.dirs8] == list(Dir8)
+
+    def test_move_is_addition(self):
+        P = PackedPoints()
+        p = P.pack((3, 4))
+        for d, v in zip(P.dirs8, Dir8, strict=True):
+            assert P.unpack(p + d) == addp((3, 4), v)
+
+    def test_turns(self):
+        P = PackedPoints()
+        for d, v in zip(P.dirs, Dir, strict=True):
+            assert P.unpack(P.right[d]) == turn_right(v)
+            assert P.unpack(P.left[d]) == turn_left(v)
+
+    def test_neighbors(self):
+        P = PackedPoints()
+        p = P.pack((5, 5))
+        assert [P.unpack(q) for q in P.neighbors(p)] == list(Dir.neighbors((5, 5)))
+        assert [P.unpack(q) for q in P.neighbors8(p)] == list(Dir8.neighbors((5, 5)))
+
+
 class TestGrid:
     def test_init_simple(self):
         grid = Grid("ABC\nDEF")
@@ -143,6 +183,203 @@ class TestGrid:
         assert grid.get((5, 5)) is None
 
 
+class TestDenseGrid:
+    def test_from_cells(self):
+        grid = DenseGrid.from_cells(2, 2, list("ABCD"))
+        assert grid[1, 1] == "D"
+        assert grid.data == Grid("AB\nCD").data
+        with pytest.raises(ValueError):
+            DenseGrid.from_cells(3, 2, list("ABCD"))
+
+    def test_selected_from_grid_constructor(self):
+        grid = Grid("AB\nCD", dense=True)
+        assert isinstance(grid, DenseGrid)
+        assert not isinstance(Grid("AB\nCD"), DenseGrid)
+
+    def test_init_with_mapfn(self):
+        grid = DenseGrid("123\n456", mapfn=int)
+        assert grid.width == 3
+        assert grid.height == 2
+        assert grid[0, 0] == 1
+        assert grid[2, 1] == 6
+
+    def test_init_ragged_raises(self):
+        with pytest.raises(ValueError):
+            DenseGrid("ABC\nD")
+
+    def test_contains(self):
+        grid = DenseGrid("AB\nCD")
+        assert (0, 0) in grid
+        assert (1, 1) in grid
+        assert (2, 0) not in grid
+        assert (-1, 0) not in grid
+
+    def test_getitem_out_of_bounds_raises(self):
+        grid = DenseGrid("AB\nCD")
+        with pytest.raises(KeyError):
+            grid[2, 0]  # pyright: ignore[reportUnusedExpression]
+        with pytest.raises(KeyError):
+            grid[0, -1]  # pyright: ignore[reportUnusedExpression]
+
+    def test_setitem(self):
+        grid = DenseGrid("AB\nCD")
+        grid[1, 1] = "X"
+        assert grid[1, 1] == "X"
+        assert grid.cells == ["A", "B", "C", "X"]
+
+    def test_find_and_findall(self):
+        grid = DenseGrid("ABA\nCDC")
+        assert grid.find("D") == (1, 1)
+        assert grid.findall("A") == [(0, 0), (2, 0)]
+        assert grid.findall("X") == []
+
+    def test_get(self):
+        grid = DenseGrid("AB\nCD")
+        assert grid.get((1, 0)) == "B"
+        assert grid.get((5, 5)) is None
+        assert grid.get((-1, 0), "X") == "X"
+
+    def test_data_matches_grid(self):
+        assert DenseGrid("AB\nCD").data == Grid("AB\nCD").data
+
+    def test_data_is_live(self):
+        grid = DenseGrid("AB\nCD")
+        grid.data[1, 0] = "X"
+        assert grid[1, 0] == "X"
+        grid[0, 1] = "Y"
+        assert grid.data[0, 1] == "Y"
+        assert (5, 5) not in grid.data
+        assert len(grid.data) == 4
+        with pytest.raises(TypeError):
+            del grid.data[0, 0]
+
+    def test_contains_non_points(self):
+        for grid in (Grid("AB\nCD"), Grid("AB\nCD", dense=True)):
+            assert (1, 1) in grid
+            assert (2, 0) not in grid
+            assert "A" not in grid
+            assert (0, 0, 0) not in grid
+            assert None not in grid
+
+    def test_find_missing_matches_grid(self):
+        with pytest.raises(StopIteration):
+            Grid("AB\nCD").find("Z")
+        with pytest.raises(StopIteration):
+            DenseGrid("AB\nCD").find("Z")
+
+    def test_index_and_point(self):
+        grid = DenseGrid("ABC\nDEF")
+        assert grid.index((2, 1)) == 5
+        assert grid.point(5) == (2, 1)
+        assert grid.cells[grid.index((1, 1))] == "E"
+
+    def test_neighbors(self):
+        grid = DenseGrid("ABC\nDEF\nGHI")
+        assert grid.neighbors(grid.index((1, 1))) == [1, 5, 7, 3]
+        assert grid.neighbors(0) == [1, 3]
+        assert grid.neighbors(8) == [5, 7]
+        assert sorted(grid.neighbors(2)) == [1, 5]
+
+
+class TestGridEdges:
+    MAZE = "S.#\n#..\n..E"
+
+    def test_edges_between_open_cells(self):
+        G = Grid(self.MAZE).edges(lambda a, b: b != "#")
+        assert isinstance(G, GridEdges)
+        assert set(G[0, 0]) == {(1, 0)}
+        assert set(G[1, 1]) == {(1, 0), (2, 1), (1, 2)}
+
+    def test_predicate_sees_both_values(self):
+        G = Grid("012\n121", int).edges(lambda a, b: b == a + 1)
+        assert set(G[0, 0]) == {(1, 0), (0, 1)}
+        assert set(G[1, 0]) == {(2, 0), (1, 1)}
+        assert set(G[2, 0]) == set()
+
+    def test_diagonal(self):
+        G = Grid(self.MAZE).edges(lambda a, b: b != "#", diagonal=True)
+        assert set(G[0, 0]) == {(1, 0), (1, 1)}
+
+    def test_dense_grid(self):
+        dense = Grid(self.MAZE, dense=True).edges(lambda a, b: b != "#")
+        sparse = Grid(self.MAZE).edges(lambda a, b: b != "#")
+        assert list(dense) == list(sparse)
+        assert all(dense[p] == sparse[p] for p in sparse)
+
+    def test_ragged_grid(self):
+        G = Grid("ab\nabc").edges(lambda a, b: True)
+        assert set(G[2, 1]) == {(1, 1)}
+        assert set(G[1, 0]) == {(0, 0), (1, 1)}
+
+    def test_lookups_are_not_rebuilt(self):
+        G = Grid(self.MAZE).edges(lambda a, b: b != "#")
+        assert G[1, 1] is G[1, 1]
+
+    def test_ragged_grid_iterates_existing_cells(self):
+        G = Grid("ab\nabc").edges(lambda a, b: True)
+        assert sorted(G) == [(0, 0), (0, 1), (1, 0), (1, 1), (2, 1)]
+
+    def test_out_of_bounds(self):
+        G = Grid(self.MAZE).edges(lambda a, b: True)
+        with pytest.raises(KeyError):
+            G[3, 0]
+
+    def test_index_level(self):
+        G = Grid(self.MAZE).edges(lambda a, b: b != "#")
+        i = G.index((1, 1))
+        assert [G.point(j) for j in G.neighbors(i)] == list(G[1, 1])
+
+    def test_with_shortest_path(self):
+        G = Grid(self.MAZE).edges(lambda a, b: b != "#")
+        assert shortest_path_length(G, (0, 0), (2, 2)) == 4
+        assert all_shortest_path_lengths(G)[(0, 0), (2, 2)] == 4
+
+
+class TestCompressedPlane:
+    def test_bounds_include_gaps(self):
+        plane = CompressedPlane([(10, 5), (11, 5), (20, 100)])
+        assert plane.x_bounds == [10, 11, 12, 20, 21]
+        assert plane.y_bounds == [5, 6, 100, 101]
+        assert (plane.width, plane.height) == (4, 3)
+
+    def test_compress_and_expand(self):
+        plane = CompressedPlane([(10, 5), (11, 5), (20, 100)])
+        assert plane.compress((20, 100)) == (3, 2)
+        assert plane.expand((3, 2)) == (20, 100)
+        assert plane.compress((15, 50)) == (2, 1)  # inside both gaps
+        assert plane.rect((2, 1)) == ((12, 6), (19, 99))
+        assert plane.area((2, 1)) == 8 * 94
+
+    def test_areas_cover_the_plane(self):
+        plane = CompressedPlane([(0, 0), (9, 3), (4, 7)])
+        cells = [(i, j) for i in range(plane.width) for j in range(plane.height)]
+        assert sum(plane.area(q) for q in cells) == 10 * 8
+
+    def test_grid_view(self):
+        plane = CompressedPlane([(10, 5), (11, 5), (20, 100)])
+        grid = plane.grid(plane.area)
+        assert isinstance(grid, DenseGrid)
+        assert (grid.width, grid.height) == (plane.width, plane.height)
+        assert grid[2, 1] == 8 * 94
+        assert grid.find(1) == (0, 0)
+        assert grid.edges(lambda a, b: True)[0, 0] == ((1, 0), (0, 1))
+
+    def test_summed_area_counts_original_points(self):
+        rng = random.Random(0)
+        points = [(rng.randrange(50), rng.randrange(50)) for _ in range(8)]
+        plane = CompressedPlane(points)
+        table = plane.summed_area(lambda q: (q[0] + q[1]) % 2)
+        for a, b in combinations(points, 2):
+            ca, cb = plane.compress(a), plane.compress(b)
+            expected = sum(
+                plane.area((i, j))
+                for i in range(min(ca[0], cb[0]), max(ca[0], cb[0]) + 1)
+                for j in range(min(ca[1], cb[1]), max(ca[1], cb[1]) + 1)
+                if (i + j) % 2
+            )
+            assert table[ca, cb] == expected
+
+
 class TestMDist:
     def test_same_point(self):
         assert mdist((0, 0), (0, 0)) == 0
@@ -160,6 +397,14 @@ class TestMDist:
         assert mdist((-3, -4), (2, 1)) == 10
 
 
+class TestMDistTo:
+    def test_matches_mdist(self):
+        h = mdist_to((3, 4))
+        assert h((3, 4)) == 0
+        assert h((0, 0)) == mdist((0, 0), (3, 4)) == 7
+        assert h((-2, 6)) == 7
+
+
 class TestOpposite:
     def test_north_south(self):
         assert opposite(Dir.N) == Dir.S
@@ -292,3 +537,36 @@ class TestLineBetween:
     def test_negative_slope(self):
         result = line_between((0, 2), (2, 0))
         assert result == [(0, 2), (1, 1), (2, 0)]
+
+
+class TestClosestPairs:
+    def test_small(self):
+        points = [(0, 0, 0), (10, 0, 0), (1, 1, 1)]
+        assert list(closest_pairs(points)) == [(3, 0, 2), (83, 1, 2), (100, 0, 1)]
+
+    def test_matches_brute_force(self):
+        rng = random.Random(25)
+        points = [tuple(rng.randrange(1000) for _ in range(3)) for _ in range(150)]
+        expected = sorted(
+            (sum((a - b) ** 2 for a, b in zip(p, q, strict=True)), i, j)
+            for (i, p), (j, q) in combinations(enumerate(points), 2)
+        )
+        pairs = list(closest_pairs(points))
+        assert [d2 for d2, _, _ in pairs] == [d2 for d2, _, _ in expected]
+        assert sorted(pairs) == expected
+
+    def test_duplicate_points(self):
+        assert list(closest_pairs([(1, 1), (1, 1)])) == [(0, 0, 1)]
+
+    def test_single_point(self):
+        assert list(closest_pairs([(1, 2)])) == []
+
+    def test_spread_out(self):
+        # Far more spread than the initial radius estimate suggests.
+        points = [(0, 0), (1, 0), (10**6, 10**6)]
+        d2s = [d2 for d2, _, _ in closest_pairs(points)]
+        assert d2s == [1, 2 * 10**12 - 2 * 10**6 + 1, 2 * 10**12]
+
+    def test_lazy(self):
+        points = [(x, y) for x in range(100) for y in range(100)]
+        assert next(closest_pairs(points)) == (1, 0, 1)
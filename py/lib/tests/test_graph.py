@@ -1,9 +1,16 @@
+from collections.abc import Iterable
+from itertools import pairwise
 from typing import ClassVar
 
+import pytest
+
+from aoc.coords import Dir, Point, mdist_to
 from aoc.graph import (
     Goal,
+    Sources,
     all_shortest_path_lengths,
     all_shortest_paths,
+    distance_matrix,
     shortest_path,
     shortest_path_length,
 )
@@ -202,6 +209,183 @@ class TestAllShortestPaths:
         assert [1, 3, 4] in paths
 
 
+class TestSources:
+    def test_nearest_source_wins(self):
+        G = simple_graph()
+        assert shortest_path_length(G, Sources([1, 2]), 3) == 1
+
+    def test_all_distances(self):
+        G = disconnected_graph()
+        assert shortest_path_length(G, Sources([1, 3])) == {1: 0, 2: 1, 3: 0, 4: 1}
+
+    def test_weighted(self):
+        G = WeightedGraph()
+        assert shortest_path_length(G, Sources(["A", "C"]), "D", G.weight) == 1
+
+    def test_tuple_nodes(self):
+        G = {(0, 0): {(0, 1)}, (0, 1): {(1, 1)}, (1, 0): {(1, 1)}, (1, 1): set()}
+        assert shortest_path_length(G, Sources([(0, 0), (1, 0)]), (1, 1)) == 1
+        assert shortest_path(G, Sources([(0, 0), (1, 0)]), (1, 1)) == [(1, 0), (1, 1)]
+
+    def test_shortest_path(self):
+        G = simple_graph()
+        assert shortest_path(G, Sources([1, 2]), 3) == [2, 3]
+        assert shortest_path(G, Sources([1, 3]), 3) == [3]
+
+    def test_shortest_path_weighted(self):
+        G = WeightedGraph()
+        assert shortest_path(G, Sources(["A", "C"]), "D", G.weight) == ["C", "D"]
+
+    def test_all_shortest_paths(self):
+        G = diamond_graph()
+        paths = all_shortest_paths(G, Sources([2, 3]), 4)
+        assert sorted(paths) == [[2, 4], [3, 4]]
+        paths = all_shortest_paths(G, Sources([2, 3]), 4, weight=lambda a, b: 1)
+        assert sorted(paths) == [[2, 4], [3, 4]]
+
+    def test_no_path(self):
+        G = disconnected_graph()
+        assert shortest_path_length(G, Sources([2, 4]), 1) == -1
+        assert shortest_path(G, Sources([2, 4]), 1) == []
+
+
+class OpenGrid:
+    def __init__(self, size: int, walls: Iterable[Point] = ()):
+        self.size = size
+        self.walls = set(walls)
+
+    def __getitem__(self, p: Point) -> set[Point]:
+        return {
+            (x, y)
+            for x, y in Dir.neighbors(p)
+            if 0 <= x < self.size and 0 <= y < self.size and (x, y) not in self.walls
+        }
+
+
+class TestAStar:
+    def test_matches_bfs(self):
+        G = OpenGrid(10, {(1, y) for y in range(9)} | {(3, y) for y in range(1, 10)})
+        goal = (9, 9)
+        assert shortest_path_length(G, (0, 0), goal, heuristic=mdist_to(goal)) == (
+            shortest_path_length(G, (0, 0), goal)
+        )
+
+    def test_expands_fewer_nodes(self):
+        expanded = set()
+
+        class CountingGrid(OpenGrid):
+            def __getitem__(self, p: Point) -> set[Point]:
+                expanded.add(p)
+                return super().__getitem__(p)
+
+        goal = (19, 19)
+        G = CountingGrid(20)
+        shortest_path_length(G, (0, 0), goal)
+        bfs_expanded = len(expanded)
+        expanded.clear()
+        assert shortest_path_length(G, (0, 0), goal, heuristic=mdist_to(goal)) == 38
+        assert len(expanded) < bfs_expanded
+
+    def test_weighted(self):
+        G = WeightedGraph()
+        h = {"A": 2, "B": 1, "C": 1, "D": 0}.__getitem__
+        assert shortest_path_length(G, "A", "D", G.weight, h) == 2
+        assert shortest_path(G, "A", "D", G.weight, h) == ["A", "B", "D"]
+
+    def test_no_path(self):
+        G = disconnected_graph()
+        assert shortest_path_length(G, 1, 4, heuristic=lambda n: 0) == -1
+        assert shortest_path(G, 1, 4, heuristic=lambda n: 0) == []
+
+    def test_shortest_path(self):
+        G = OpenGrid(3, {(1, 0), (1, 1)})
+        goal = (2, 0)
+        path = shortest_path(G, (0, 0), goal, heuristic=mdist_to(goal))
+        assert path == [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0)]
+
+    def test_all_shortest_paths(self):
+        G = OpenGrid(2)
+        goal = (1, 1)
+        paths = all_shortest_paths(G, (0, 0), goal, heuristic=mdist_to(goal))
+        assert sorted(paths) == [[(0, 0), (0, 1), (1, 1)], [(0, 0), (1, 0), (1, 1)]]
+
+    def test_with_goal(self):
+        G = OpenGrid(5)
+        goal = Goal[Point](lambda p: p[0] == 4)
+        assert shortest_path_length(G, (0, 2), goal, heuristic=lambda p: 4 - p[0]) == 4
+
+
+def reversed_graph(G: dict[int, set[int]]) -> dict[int, set[int]]:
+    R: dict[int, set[int]] = {n: set() for n in G}
+    for a, bs in G.items():
+        for b in bs:
+            R[b].add(a)
+    return R
+
+
+class TestBidirectional:
+    def test_directed(self):
+        G = simple_graph()
+        R = reversed_graph(G)
+        assert shortest_path_length(G, 1, 3, reverse=R) == 2
+        assert shortest_path_length(G, 3, 1, reverse=R) == -1
+        assert shortest_path(G, 1, 3, reverse=R) == [1, 2, 3]
+
+    def test_same_source_and_target(self):
+        G = simple_graph()
+        assert shortest_path_length(G, 1, 1, reverse=G) == 0
+        assert shortest_path(G, 1, 1, reverse=G) == [1]
+
+    def test_no_path(self):
+        G = disconnected_graph()
+        R = reversed_graph(G)
+        assert shortest_path_length(G, 1, 4, reverse=R) == -1
+        assert shortest_path(G, 1, 4, reverse=R) == []
+
+    def test_matches_bfs_on_grid(self):
+        walls = {(2, y) for y in range(7)} | {(5, y) for y in range(2, 9)} | {(7, 1), (7, 2)}
+        G = OpenGrid(9, walls)
+        for goal in [(8, 0), (8, 8), (0, 8), (3, 3), (6, 0)]:
+            expected = shortest_path_length(G, (0, 0), goal)
+            assert shortest_path_length(G, (0, 0), goal, reverse=G) == expected
+            path = shortest_path(G, (0, 0), goal, reverse=G)
+            assert len(path) == expected + 1
+            assert path[0] == (0, 0)
+            assert path[-1] == goal
+            assert all(b in G[a] for a, b in pairwise(path))
+
+    def test_with_sources(self):
+        G = simple_graph()
+        R = reversed_graph(G)
+        assert shortest_path_length(G, Sources([1, 2]), 3, reverse=R) == 1
+        assert shortest_path(G, Sources([1, 2]), 3, reverse=R) == [2, 3]
+
+    def test_explores_fewer_nodes(self):
+        expanded = set()
+
+        class CountingGrid(OpenGrid):
+            def __getitem__(self, p: Point) -> set[Point]:
+                expanded.add(p)
+                return super().__getitem__(p)
+
+        G = CountingGrid(30)
+        shortest_path_length(G, (0, 15), (29, 15))
+        bfs_expanded = len(expanded)
+        expanded.clear()
+        assert shortest_path_length(G, (0, 15), (29, 15), reverse=G) == 29
+        assert len(expanded) < bfs_expanded
+
+    def test_requires_target_node(self):
+        G = diamond_graph()
+        with pytest.raises(ValueError):
+            shortest_path_length(G, 1, Goal(lambda n: n == 4), reverse=G)
+
+    def test_requires_unweighted(self):
+        G = WeightedGraph()
+        with pytest.raises(ValueError):
+            shortest_path_length(G, "A", "D", G.weight, reverse=G)
+
+
 class TestBFS:
     """Tests to verify BFS optimization works correctly for unweighted graphs."""
 
@@ -281,3 +465,45 @@ class TestAllShortestPathLengths:
             (3, 4): 1,
             (4, 4): 0,
         }
+
+    def test_weighted(self):
+        G = WeightedGraph()
+        distances = all_shortest_path_lengths(G.edges | {"D": set()}, G.weight)
+        assert distances["A", "D"] == 2
+        assert distances["A", "C"] == 5
+        assert ("D", "A") not in distances
+
+
+class TestDistanceMatrix:
+    def test_subset(self):
+        G = diamond_graph()
+        D = distance_matrix(G, [1, 4])
+        assert D.nodes == [1, 4]
+        assert len(D) == 2
+        assert D[1, 4] == 2
+        assert D[1, 1] == 0
+        assert D[4, 1] == -1
+
+    def test_index_and_rows(self):
+        G = simple_graph()
+        D = distance_matrix(G, [3, 1, 2])
+        assert D.index == {3: 0, 1: 1, 2: 2}
+        assert D.rows == [[0, -1, -1], [2, 0, 1], [1, -1, 0]]
+
+    def test_duplicate_nodes(self):
+        D = distance_matrix(simple_graph(), [1, 3, 1])
+        assert D.nodes == [1, 3]
+        assert D[1, 3] == 2
+
+    def test_weighted(self):
+        G = WeightedGraph()
+        D = distance_matrix(G, ["A", "C", "D"], G.weight)
+        assert D["A", "D"] == 2
+        assert D["A", "C"] == 5
+        assert D["C", "D"] == 1
+
+    def test_matches_all_shortest_path_lengths(self):
+        G = diamond_graph()
+        D = distance_matrix(G, G)
+        distances = all_shortest_path_lengths(G)
+        assert {(a, b): D[a, b] for a in G for b in G if D[a, b] >= 0} == distances
@@ -1,6 +1,9 @@
+import random
 from fractions import Fraction
 
-from aoc.linalg import to_reduced_row_echelon_form
+import pytest
+
+from aoc.linalg import fraction_free_rref, fraction_free_rref_many, to_reduced_row_echelon_form
 
 
 class TestToReducedRowEchelonForm:
@@ -91,3 +94,47 @@ class TestToReducedRowEchelonForm:
             [0, 1, 1, 4],
             [0, 0, 0, 0],
         ]
+
+
+class TestFractionFreeRref:
+    def test_with_fractions(self):
+        result = fraction_free_rref([[2, 4, 10], [3, 1, 8]])
+        assert result.denominator == 10
+        assert result.matrix == [[10, 0, 22], [0, 10, 14]]
+        assert result.to_fractions() == [[1, 0, Fraction(11, 5)], [0, 1, Fraction(7, 5)]]
+        assert (result.pivots, result.free, result.rank) == ([0, 1], [], 2)
+
+    def test_free_columns(self):
+        # x + z = 3, y + z = 2: z is free
+        result = fraction_free_rref([[1, 0, 1, 3], [0, 1, 1, 2], [1, 1, 2, 5]])
+        assert (result.pivots, result.free) == ([0, 1], [2])
+        assert result.consistent
+
+    def test_inconsistent(self):
+        result = fraction_free_rref([[1, 1, 2], [2, 2, 5]])
+        assert not result.consistent
+
+    def test_denominator_is_positive(self):
+        result = fraction_free_rref([[-3, 6]])
+        assert result.denominator == 3
+        assert result.matrix == [[3, -6]]
+
+    @pytest.mark.parametrize("seed", range(30))
+    def test_matches_fraction_elimination(self, seed):
+        rng = random.Random(seed)
+        m, n = rng.randint(1, 6), rng.randint(1, 6)
+        coeffs = [
+            [rng.choice([0, 0, 1, -1, rng.randint(-9, 9)]) for _ in range(n)] for _ in range(m)
+        ]
+        # Consistent, so the reduced form doesn't depend on the choice of pivot rows.
+        solution = [rng.randint(-5, 5) for _ in range(n)]
+        matrix = [[*row, sum(a * x for a, x in zip(row, solution, strict=True))] for row in coeffs]
+        result = fraction_free_rref(matrix)
+        expected = to_reduced_row_echelon_form(matrix)
+        assert result.to_fractions()[: result.rank] == expected[: result.rank]
+        assert result.consistent
+        assert all(x == 0 for row in result.matrix[result.rank :] for x in row)
+
+    def test_many(self):
+        matrices = [[[2, 4, 10], [3, 1, 8]], [[1, 1, 2], [2, 2, 5]]]
+        assert fraction_free_rref_many(matrices) == [fraction_free_rref(m) for m in matrices]
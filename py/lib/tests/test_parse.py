@@ -1,6 +1,22 @@
+from array import array
+from dataclasses import dataclass
+from typing import NamedTuple
+
 import pytest
 
-from aoc.parse import all_numbers, first_number, line_parser, paras
+from aoc.parse import (
+    all_numbers,
+    first_number,
+    iter_lines,
+    iter_numbers,
+    iter_paras,
+    line_parser,
+    number_array,
+    number_columns,
+    paras,
+    record_format,
+    records,
+)
 
 
 class TestAllNumbers:
@@ -35,6 +51,52 @@ class TestAllNumbers:
         assert all_numbers("10\n20") == [10, 20]
 
 
+class TestIterNumbers:
+    def test_matches_all_numbers(self):
+        s = "x=10, y=-5\nz=+3"
+        assert list(iter_numbers(s)) == all_numbers(s) == [10, -5, 3]
+
+    def test_unsigned(self):
+        assert list(iter_numbers("10-20", unsigned=True)) == [10, 20]
+
+    def test_is_lazy(self):
+        numbers = iter_numbers("1 2 3")
+        assert next(numbers) == 1
+        assert list(numbers) == [2, 3]
+
+
+class TestNumberArray:
+    def test_matches_all_numbers(self):
+        s = "p=0,4 v=3,-3\np=6,3 v=-1,+3"
+        result = number_array(s)
+        assert result.typecode == "q"
+        assert list(result) == all_numbers(s)
+
+    def test_unsigned(self):
+        assert list(number_array("10-20", unsigned=True)) == [10, 20]
+
+    def test_empty(self):
+        assert len(number_array("")) == 0
+
+    def test_too_large(self):
+        with pytest.raises(OverflowError):
+            number_array(str(2**64))
+
+
+class TestNumberColumns:
+    def test_columns(self):
+        xs, ys = number_columns("1,2\n3,4\n5,6", 2)
+        assert list(xs) == [1, 3, 5]
+        assert list(ys) == [2, 4, 6]
+
+    def test_empty(self):
+        assert number_columns("", 3) == [array("q")] * 3
+
+    def test_uneven(self):
+        with pytest.raises(ValueError):
+            number_columns("1,2\n3", 2)
+
+
 class TestFirstNumber:
     def test_single_number(self):
         assert first_number("42") == 42
@@ -86,6 +148,17 @@ class TestLineParser:
         assert identity("single") == ["single"]
 
 
+class TestIterLines:
+    @pytest.mark.parametrize("s", ["", "single", "a\nb", "a\nb\n", "a\n\nb", "\n", "\n\n", "\na"])
+    def test_matches_splitlines(self, s):
+        assert list(iter_lines(s)) == s.splitlines()
+
+    def test_is_lazy(self):
+        lines = iter_lines("1\n2\n3")
+        assert next(lines) == "1"
+        assert list(lines) == ["2", "3"]
+
+
 class TestParas:
     def test_simple_paragraphs(self):
         text = "line1\nline2\n\nline3\nline4"
@@ -116,3 +189,96 @@ class TestParas:
     def test_with_mapper_and_multiple_paragraphs(self):
         text = "1\n2\n\n3\n4\n\n5"
         assert paras(text, lambda x: int(x) * 2) == [[2, 4], [6, 8], [10]]
+
+
+class TestIterParas:
+    @pytest.mark.parametrize(
+        "s",
+        [
+            "",
+            "single",
+            "line1\nline2\n\nline3\nline4",
+            "a\n\n\nb",
+            "line1\nline2\n",
+            "a\n\n",
+            "\n\na",
+            "1\n2\n\n3\n4\n\n5\n",
+        ],
+    )
+    def test_matches_paras(self, s):
+        assert list(iter_paras(s)) == paras(s)
+
+    def test_with_mapper(self):
+        assert list(iter_paras("1\n2\n\n3", int)) == [[1, 2], [3]]
+
+    def test_is_lazy(self):
+        groups = iter_paras("a\n\nb")
+        assert next(groups) == ["a"]
+        assert list(groups) == [["b"]]
+
+
+class TestRecords:
+    VALVES = """Valve AA has flow rate=0; tunnels lead to valves DD, II, BB
+Valve HH has flow rate=22; tunnel leads to valve GG
+"""
+    VALVE = "Valve {name:word} has flow rate={rate:int}; {} valve{} {tunnels:words}"
+
+    def test_typed_fields(self):
+        assert records(self.VALVE, self.VALVES) == [
+            ("AA", 0, ["DD", "II", "BB"]),
+            ("HH", 22, ["GG"]),
+        ]
+
+    def test_strings_only(self):
+        assert records("{a}-{b}", "x-y\nfoo-bar") == [("x", "y"), ("foo", "bar")]
+
+    def test_ints_and_braces(self):
+        template = "[{lights}] {buttons} {{{joltages:ints}}}"
+        line = "[.##.] (3) (1,3) {3,5,-4,7}"
+        assert records(template, line) == [(".##.", "(3) (1,3)", [3, 5, -4, 7])]
+
+    def test_into_namedtuple(self):
+        class Part(NamedTuple):
+            x: int
+            m: int
+
+        assert records("{{x={x:int},m={m:int}}}", "{x=1,m=-2}\n{x=3,m=4}", Part) == [
+            Part(1, -2),
+            Part(3, 4),
+        ]
+
+    def test_into_slotted_dataclass(self):
+        @dataclass(slots=True)
+        class Point:
+            x: int
+            y: int
+
+        assert records("{x:int},{y:int}", "1,2", Point) == [Point(1, 2)]
+
+    def test_no_trailing_newline(self):
+        assert records("{n:int}", "1\n2") == [(1,), (2,)]
+
+    def test_empty(self):
+        assert records("{n:int}", "") == []
+
+    def test_mismatch_raises(self):
+        with pytest.raises(ValueError, match="'x'"):
+            records("{n:int}", "1\nx\n3\n")
+
+    def test_partial_line_raises(self):
+        with pytest.raises(ValueError):
+            records("{n:int}", "12 and more")
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError, match="unknown field type"):
+            record_format("{n:float}")
+
+    def test_fields_and_cache(self):
+        fmt = record_format(self.VALVE)
+        assert fmt.fields == ("name", "rate", "tunnels")
+        assert record_format(self.VALVE) is fmt
+
+    def test_match(self):
+        assert record_format("{a:int}x{b:word}").match("5xfoo") == (5, "foo")
+        with pytest.raises(ValueError):
+            record_format("{a:int}").match("5\n6")
@@ -3,6 +3,7 @@ import pytest
 from aoc.util import (
     chunks,
     flip_rows_cols,
+    format_bytes,
     mod_range,
     ndigits,
     ocr,
@@ -108,6 +109,15 @@ class TestNDigits:
         assert ndigits(d) == expected
 
 
+class TestFormatBytes:
+    def test_units(self):
+        assert format_bytes(0) == "0 B"
+        assert format_bytes(1023) == "1023 B"
+        assert format_bytes(1536) == "2 KiB"
+        assert format_bytes(5 * 1024**2) == "5 MiB"
+        assert format_bytes(3 * 1024**3) == "3.0 GiB"
+
+
 class TestMod:
     testdata = (
         ((0, 1, 5), 4),